@@ -1,23 +1,45 @@
-import pint
-units = pint.UnitRegistry()
+# -- Version -----------------------------------------------------------------
 
+# Keep in line with the release in docs/conf.py
+__version__ = '0.1.0-beta'
 
-# -- A helper function to set units ------------------------------------------
 
-def set_units(dim, unit_system):
-    """ A private helper function that returns the Pint units to be attached
-    to a variable based on the set unit system and dimensionality (dim).
+# -- Lazy unit registry ------------------------------------------------------
 
-    Args:
-        dim (str): The dimensionality for the variable. For example, layer
-            height is 'length'.
+def __getattr__(name):
+    """ Module level attribute hook that creates the Pint unit registry,
+    ``edafos.units``, the first time it is used. Building the registry is
+    the single most expensive part of importing ``edafos``, so modules that
+    do not need units do not pay for it.
+    """
+    if name == 'units':
+        return _registry()
+    raise AttributeError("module 'edafos' has no attribute '{}'"
+                         "".format(name))
 
-        unit_system (str): The unit system, 'SI' or 'English'.
 
-    Returns:
-        Pint units.
+def _registry():
+    """ A private helper function that returns the Pint unit registry,
+    creating it on first use.
+    """
+    if 'units' not in globals():
+        import pint
+        globals()['units'] = pint.UnitRegistry()
+
+    return globals()['units']
+
+
+# -- Precomputed units -------------------------------------------------------
 
+def _unit_table():
+    """ A private helper function that builds the Pint units for every
+    dimensionality (dim) and unit system. It runs once, the first time units
+    are requested, so resolving units afterwards is a dictionary lookup.
+
+    Returns:
+        dict: Pint units keyed by unit system and then dimensionality.
     """
+    units = _registry()
     unit_dict = {
         'degrees': {'SI': units.degree, 'English': units.degree},
         'length': {'SI': units.meter, 'English': units.feet},
@@ -40,4 +62,30 @@ def set_units(dim, unit_system):
         'pile_settlement': {'SI': units.mm, 'English': units.inches},
     }
 
-    return unit_dict[dim][unit_system]
+    return {system: {dim: unit_dict[dim][system] for dim in unit_dict}
+            for system in ['SI', 'English']}
+
+
+_units = {}
+
+
+# -- A helper function to set units ------------------------------------------
+
+def set_units(dim, unit_system):
+    """ A private helper function that returns the Pint units to be attached
+    to a variable based on the set unit system and dimensionality (dim).
+
+    Args:
+        dim (str): The dimensionality for the variable. For example, layer
+            height is 'length'.
+
+        unit_system (str): The unit system, 'SI' or 'English'.
+
+    Returns:
+        Pint units.
+
+    """
+    if not _units:
+        _units.update(_unit_table())
+
+    return _units[unit_system][dim]
@@ -1,3 +1,5 @@
 from .piles import Pile
-from .capacity_api import Olson90
+from .capacity_api import Olson90, RevisedAPI
 from .loadtest import LoadTest
+from .analysis import AnalysisContext
+from .cache import ResultCache
@@ -0,0 +1,234 @@
+""" Provide the ``PileGeometry`` class.
+
+"""
+
+# -- Imports -----------------------------------------------------------------
+from edafos.data import english_hpiles
+import numpy as np
+import copy
+
+
+# -- Polygon shape coefficients ----------------------------------------------
+
+# Number of faces and area per squared side length for polygon concrete piles
+polygon_coefs = {
+    'square-solid': (4, 1),
+    'square-hollow': (4, 1),
+    'hexagon': (6, (3/2) * np.sqrt(3)),
+    'octagon': (8, 2 * (1 + np.sqrt(2))),
+}
+
+
+# -- PileGeometry Class ------------------------------------------------------
+
+class PileGeometry(object):
+    """ Class to represent the precompiled geometry of a
+    :class:`~edafos.deepfoundations.piles.Pile`.
+
+    The taper breakpoints and the perimeter/area coefficients of the pile
+    shape are worked out once, when the pile is created, so that every
+    geometry query is a plain NumPy evaluation that also accepts arrays. All
+    positions are lengths, :math:`x`, measured along the pile from its top.
+    It is not anticipated that users will interact with this class.
+
+    """
+
+    # -- Constructor ---------------------------------------------------------
+
+    def __init__(self, pile):
+        """
+        Args:
+            pile (class): The ``Pile`` object, after its properties have been
+                checked and assigned units.
+        """
+        # Factor that converts pile_diameter units into length units
+        self.c = (1 * pile.set_units('pile_diameter')).to(
+            pile.set_units('length')).magnitude
+        self.length = pile.length.magnitude
+
+        # -- Taper breakpoints -----------------------------------------------
+        top = pile.side if pile.side is not None else pile.diameter
+        if pile.taper_dims is None:
+            self.di = np.array([top.magnitude, top.magnitude], dtype=float)
+            self.li = np.array([0, self.length], dtype=float)
+        else:
+            self.di = np.array([top.magnitude] + [i[0].magnitude for i in
+                                                  pile.taper_dims],
+                               dtype=float)
+            self.li = np.cumsum([0] + [i[1].magnitude for i in
+                                       pile.taper_dims], dtype=float)
+
+        # -- Shape coefficients ----------------------------------------------
+        # Perimeter and area per side (or diameter) and squared side
+        self.hpile = None
+        if pile.pile_type == 'h-pile':
+            self.kind = 'h-pile'
+            # TODO: adjust to accept si piles as well
+            self.hpile = english_hpiles.get(pile.shape)
+        elif (pile.pile_type == 'concrete') and (pile.shape in polygon_coefs):
+            self.kind = 'polygon'
+            self.perimeter, self.area = polygon_coefs[pile.shape]
+        else:
+            self.kind = 'circle'
+            self.perimeter, self.area = np.pi, np.pi / 4
+
+        # Open-ended piles have a ring toe unless plugged with soil
+        self.open_toe = ((pile.pile_type == 'pipe-open') or
+                         (pile.shape == 'circle-open'))
+        # Only open steel pipes have an inside wall for plugged calculations
+        self.inside_wall = pile.pile_type == 'pipe-open'
+        self.t = (pile.thickness.magnitude * self.c
+                  if self.open_toe else 0.)
+
+    # -- Method for pile a/d along the pile ----------------------------------
+
+    def a_d(self, x):
+        """ Method that returns the side, :math:`a`, or diameter, :math:`d`,
+        of the pile at lengths :math:`x` from its top.
+
+        Args:
+            x (array_like): Lengths along the pile (unitless).
+
+        Returns:
+            array: Sides or diameters in ``pile_diameter`` units.
+        """
+        return np.interp(x, self.li, self.di)
+
+    # -- Method for a longer (or shorter) prismatic pile ---------------------
+
+    def extended(self, length):
+        """ Method that returns the geometry of the same pile section with a
+        different length, keeping the pile head where it is. Only prismatic
+        piles can be extended.
+
+        Args:
+            length (float): The new pile length (unitless).
+
+        Returns:
+            PileGeometry: A new geometry object.
+        """
+        if (len(self.li) > 2) or (self.di[0] != self.di[-1]):
+            raise ValueError("Tapered piles cannot be extended. Use a "
+                             "prismatic pile instead.")
+        geometry = copy.copy(self)
+        geometry.length = float(length)
+        geometry.li = np.array([0, length], dtype=float)
+
+        return geometry
+
+    # -- Private method for H-pile section properties ------------------------
+
+    def _hpile_prop(self, key):
+        if self.hpile is None:
+            raise ValueError("No section properties available for this "
+                             "H-pile shape.")
+        return self.hpile[key]
+
+    # -- Method for cross sectional areas ------------------------------------
+
+    def xsection_area(self, x, soil_plug=False, box_area=False):
+        """ Method that returns cross sectional areas at lengths :math:`x`
+        from the top of the pile. Areas are zero off the pile.
+
+        Args:
+            x (array_like): Lengths along the pile (unitless).
+            soil_plug (bool): If ``TRUE``, returns the full area of open-ended
+                piles.
+            box_area (bool): For H-piles, if ``TRUE``, returns the box area.
+
+        Returns:
+            array: Cross sectional areas in ``pile_xarea_alt`` units.
+        """
+        x = np.asarray(x, dtype=float)
+
+        if self.kind == 'h-pile':
+            key = 'box_area' if box_area else 'area'
+            area = np.full(x.shape, self._hpile_prop(key) * self.c ** 2)
+        else:
+            d = self.a_d(x) * self.c
+            if self.open_toe and not soil_plug:
+                area = np.pi * ((d ** 2) - (d - 2 * self.t) ** 2) / 4
+            else:
+                area = self.area * d ** 2
+
+        return np.where((x < 0) | (x > self.length), 0., area)
+
+    # -- Method for side areas -----------------------------------------------
+
+    def side_area(self, x1, x2, box_area=False, inside=False):
+        """ Method that returns side areas of pile sections between lengths
+        :math:`x_1` and :math:`x_2` from the top of the pile. Areas are zero
+        for sections that are not entirely on the pile.
+
+        Args:
+            x1 (array_like): Lengths to the top of the sections (unitless).
+            x2 (array_like): Lengths to the bottom of the sections
+                (unitless).
+            box_area (bool): For H-piles, if ``TRUE``, returns the box area.
+            inside (bool): For open steel pipe piles only. If ``TRUE``,
+                returns the inside area of the pile.
+
+        Returns:
+            array: Side areas in ``pile_side_area`` units.
+        """
+        x1 = np.asarray(x1, dtype=float)
+        x2 = np.asarray(x2, dtype=float)
+        h = x2 - x1
+
+        if self.kind == 'h-pile':
+            key = 'box_perimeter' if box_area else 'perimeter'
+            area = self._hpile_prop(key) * self.c * h
+        else:
+            d1 = self.a_d(x1) * self.c
+            d2 = self.a_d(x2) * self.c
+            if self.kind == 'polygon':
+                # Trapezoid faces
+                area = self.perimeter * ((d1 + d2) / 2) * h
+            else:
+                if self.inside_wall and inside:
+                    d1 = d1 - 2 * self.t
+                    d2 = d2 - 2 * self.t
+                # Cone -- http://mathworld.wolfram.com/ConicalFrustum.html
+                area = np.pi * ((d1 + d2) / 2) * np.sqrt(
+                    (((d1 - d2) / 2) ** 2) + (h ** 2))
+
+        # TODO: Give these limits another thought, maybe not return zero.
+        outside = ((x1 < 0) | (x1 > self.length) | (x2 < 0) |
+                   (x2 > self.length))
+
+        return np.where(outside, 0., area)
+
+    # -- Method for the average cross sectional area -------------------------
+
+    def average_area(self):
+        """ Method that returns the exact average cross sectional area over
+        the pile length. The side, or diameter, varies linearly within every
+        taper section, so each section integrates in closed form:
+
+        .. math::
+
+           \\int_0^l c \\, d^2 \\, dx = c \\, l \\,
+           \\frac{d_1^2 + d_1 d_2 + d_2^2}{3}
+
+        and, for the ring of open-ended piles,
+
+        .. math::
+
+           \\int_0^l \\pi t (d - t) \\, dx = \\pi t \\, l \\left(
+           \\frac{d_1 + d_2}{2} - t \\right)
+
+        Returns:
+            float: Average area in ``pile_xarea_alt`` units.
+        """
+        if self.kind == 'h-pile':
+            return self._hpile_prop('area') * self.c ** 2
+
+        d1 = self.di[:-1] * self.c
+        d2 = self.di[1:] * self.c
+        l = np.diff(self.li)
+        if self.open_toe:
+            volume = np.pi * self.t * l * ((d1 + d2) / 2 - self.t)
+        else:
+            volume = self.area * l * (d1 ** 2 + d1 * d2 + d2 ** 2) / 3
+
+        return float(volume.sum() / self.length)
@@ -0,0 +1,228 @@
+""" Provide the ``AnalysisContext`` class.
+
+"""
+
+# -- Imports -----------------------------------------------------------------
+import numpy as np
+
+
+# -- Segment arrays ----------------------------------------------------------
+
+def _segments(project, top, bot, geometry=None):
+    """ A private helper function that gathers, as NumPy arrays, everything
+    the capacity methods need for segments given by their top and bottom
+    depths: stresses, soil properties and pile areas. All values are
+    unitless, in the units of the project unit system.
+
+    Args:
+        project (class): The ``Project`` object.
+        top (array): Depths to the top of the segments (unitless).
+        bot (array): Depths to the bottom of the segments (unitless).
+        geometry (PileGeometry): Pile geometry to use instead of the pile's
+            own.
+
+    Returns:
+        dict: Arrays with one value per segment, keyed by ``top``, ``bot``,
+        ``mid``, ``eff_mid`` (effective stress at midpoint), ``eff_bot``
+        (effective stress at bottom), ``layer`` (zero-based position of the
+        soil layer), ``soil_type``, ``soil_desc``, ``corr_n``, ``su`` and the
+        pile areas of :meth:`~edafos.deepfoundations.piles.Pile.segment_areas`.
+    """
+    sp = project.sp
+    mid = top + ((bot - top) / 2)
+
+    soil_type, soil_desc, corr_n, su = sp.get_soil_props(
+        bot, ['soil_type', 'soil_desc', 'corr_n', 'su'], with_units=False)
+
+    seg = {
+        'top': top, 'bot': bot, 'mid': mid,
+        'eff_mid': sp.calculate_stress(mid, with_units=False),
+        'eff_bot': sp.calculate_stress(bot, with_units=False),
+        'layer': np.searchsorted(sp._store.column('Depth'), bot),
+        'soil_type': soil_type, 'soil_desc': soil_desc,
+        'corr_n': corr_n, 'su': su,
+    }
+    seg.update(project.pile._areas_between(top, bot, geometry))
+
+    return seg
+
+
+# -- AnalysisContext Class ---------------------------------------------------
+
+class AnalysisContext(object):
+    """ Class to represent the shared inputs of capacity analyses for a
+    :class:`~edafos.project.Project`: the segment grid of
+    :meth:`~edafos.project.Project.z_layer_pile` and, for every segment, the
+    midpoint and bottom effective stresses, the soil properties and the pile
+    areas.
+
+    The context is built once and can be handed to any capacity method, e.g.
+    ``Olson90(project, context=context)``, so that running several methods
+    on the same project costs barely more than running one. After a change
+    to the project, :meth:`refresh` brings the context up to date, and after
+    :meth:`~edafos.soil.profile.SoilProfile.update_layer` it only
+    recalculates the segments that the change affects.
+
+    """
+
+    # Soil property columns and the segment arrays that depend on them
+    _dependents = {'Soil Type': 'soil_type', 'Soil Desc': 'soil_desc',
+                   'Corr. N': 'corr_n', 'Shear Su': 'su'}
+
+    # -- Constructor ---------------------------------------------------------
+
+    def __init__(self, project):
+        """
+        Args:
+            project (class): Provide the ``Project`` object as defined in the
+                :class:`~edafos.project.Project` class.
+        """
+        # Type check
+        if str(type(project)) == "<class 'edafos.project.Project'>":
+            self.project = project
+        else:
+            raise TypeError("Wrong input. Attach `Project` objects only.")
+
+        self._build()
+
+    # -- Private method that builds all segments -----------------------------
+
+    def _build(self):
+        """ Private method that calculates every segment from scratch.
+        """
+        self.z = np.asarray(self.project.z_layer_pile(), dtype=float)
+        self.segments = _segments(self.project, self.z[:-1], self.z[1:])
+
+        # Shared between methods, so keep them read-only
+        for values in self.segments.values():
+            values.flags.writeable = False
+
+        self._previous_key = None
+        self._changed = None
+        self._key = self._current_key()
+
+    # -- Private method for the state the context was built from -------------
+
+    def _current_key(self):
+        """ Private method that identifies the soil profile and pile state
+        the context depends on.
+        """
+        sp = self.project.sp
+        pile = self.project.pile
+
+        return (self.project._revision, id(sp), sp._revision, id(pile),
+                pile._revision)
+
+    # -- Method that checks the context is up to date ------------------------
+
+    def is_current(self):
+        """ Method that checks that the soil profile and pile of the project
+        have not changed since the context was built.
+
+        Returns:
+            bool: ``True`` if the context can still be used.
+        """
+        return self._key == self._current_key()
+
+    # -- Method that brings the context up to date ---------------------------
+
+    def refresh(self):
+        """ Method that brings the context up to date with the project. If
+        only layer properties or the water table changed, through
+        :meth:`~edafos.soil.profile.SoilProfile.update_layer` or
+        :attr:`~edafos.soil.profile.SoilProfile.water_table`, only the
+        affected segments are recalculated:
+
+        - the soil properties of the segments inside the changed layers, and
+        - the effective stresses of the segments below the highest change of
+          unit weight, or of all segments if the water table moved.
+
+        The segment grid and the pile areas are kept. Any other change, or a
+        water table that moves to a new segment boundary, rebuilds the
+        context.
+
+        Returns:
+            self
+        """
+        if self.is_current():
+            return self
+
+        sp = self.project.sp
+        key = self._current_key()
+        changes = None
+        if (key[:2] + key[3:]) == (self._key[:2] + self._key[3:]):
+            changes = sp._changes_since(self._key[2])
+        # The water table is also a segment boundary
+        if (changes is not None) and \
+                any('Water Table' in columns for _, columns in changes):
+            if not np.array_equal(self.project.z_layer_pile(), self.z):
+                changes = None
+        if changes is None:
+            self._build()
+            return self
+
+        seg = dict(self.segments)
+        layer = seg['layer']
+        changed = np.zeros(len(layer), dtype=bool)
+
+        # Soil properties inside the changed layers
+        for name, prop in self._dependents.items():
+            layers = [i for i, columns in changes if name in columns]
+            mask = np.isin(layer, layers)
+            if mask.any():
+                seg[prop] = seg[prop].copy()
+                seg[prop][mask] = sp.get_soil_props(
+                    seg['bot'][mask], prop, with_units=False)
+                changed |= mask
+
+        # Effective stresses downwards from the highest change, or all of
+        # them if the water table moved
+        layers = [i for i, columns in changes
+                  if not columns.isdisjoint({'TUW', 'Water Table'})]
+        if layers:
+            if None in layers:
+                mask = np.ones(len(layer), dtype=bool)
+            else:
+                mask = layer >= min(layers)
+            for prop, z in [('eff_mid', 'mid'), ('eff_bot', 'bot')]:
+                seg[prop] = seg[prop].copy()
+                seg[prop][mask] = sp.calculate_stress(
+                    seg[z][mask], with_units=False)
+            changed |= mask
+
+        for values in seg.values():
+            values.flags.writeable = False
+        self.segments = seg
+
+        self._previous_key = self._key
+        self._changed = changed
+        self._key = key
+
+        return self
+
+    # -- Private method for the segments changed by the last refresh ---------
+
+    def _changed_since(self, key):
+        """ Private method that tells which segments changed since the
+        context was in a given state.
+
+        Args:
+            key (tuple): A past state of the context.
+
+        Returns:
+            array: Boolean mask of the changed segments, or ``None`` if the
+            changes are not known and every segment must be considered new.
+        """
+        if key == self._key:
+            return np.zeros(len(self.z) - 1, dtype=bool)
+        elif (key == self._previous_key) and (self._changed is not None):
+            return self._changed
+        else:
+            return None
+
+    # -- Method for string representation ------------------------------------
+
+    def __str__(self):
+        return "Analysis Context:\n----------------\n" \
+               "Segments: {}\n" \
+               "Depths: {}".format(len(self.z) - 1, self.z.tolist())
@@ -0,0 +1,253 @@
+""" Provide the ``ResultCache`` class.
+
+"""
+
+# -- Imports -----------------------------------------------------------------
+from collections import OrderedDict
+from edafos.project import _digest
+from .capacity_base import result_dtype
+import edafos
+import numpy as np
+import os
+import re
+import tempfile
+
+
+# -- Stored results version --------------------------------------------------
+
+# Increase when the capacity formulas change, so stored results are not used
+schema_version = 1
+
+
+def _schema_tag():
+    """ A private helper function that returns the tag of results stored by
+    this version of ``edafos``: a short hash of the library version, the
+    ``schema_version`` and the fields of ``result_dtype``.
+    """
+    return _digest(['ResultCache', edafos.__version__, schema_version,
+                    str(result_dtype.descr)])[:12]
+
+
+# -- ResultCache Class -------------------------------------------------------
+
+class ResultCache(object):
+    """ Class to represent a cache of capacity analysis results, keyed on the
+    fingerprint of the analysis (see
+    :meth:`~edafos.deepfoundations.capacity_base.CapacityMethod.fingerprint`),
+    which covers the soil profile, the pile and the capacity method. The
+    segment grid of an analysis follows from the soil profile and the pile,
+    so it is covered as well.
+
+    Results are kept in memory, up to ``maxsize`` analyses, and optionally
+    in a directory with one compact ``.npz`` file per analysis, so that they
+    outlive the process. Files go in a subdirectory named after the version
+    tag of the stored results, so an upgrade of ``edafos``, or a change to
+    the formulas or to the results fields, starts from an empty store. Hand
+    the cache to the capacity methods, e.g. ``Olson90(project, cache=cache)``,
+    to only run analyses that have not been run before.
+
+    """
+
+    # Eviction policies
+    policies = ['lru', 'fifo']
+
+    # -- Constructor ---------------------------------------------------------
+
+    def __init__(self, maxsize=128, directory=None, eviction='lru'):
+        """
+        Args:
+            maxsize (int): Number of analyses kept in memory. If ``None``,
+                the memory cache is unbounded.
+            directory (str): Optional directory for the on-disk store. It is
+                created if it does not exist.
+            eviction (str): Which analysis makes room for a new one when the
+                memory cache is full. Available options are ``lru`` (the
+                least recently used) and ``fifo`` (the oldest).
+        """
+        if (maxsize is not None) and \
+                ((type(maxsize) is not int) or (maxsize < 1)):
+            raise ValueError("Cache size must be a positive integer or None.")
+        if eviction not in self.policies:
+            raise ValueError("'{}' is not a valid eviction policy. Available "
+                             "options are {}.".format(eviction, self.policies))
+
+        self.maxsize = maxsize
+        self.eviction = eviction
+        self.directory = directory
+        self.tag = _schema_tag()
+        if directory is not None:
+            os.makedirs(os.path.join(directory, self.tag), exist_ok=True)
+
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    # -- Number of analyses in memory ----------------------------------------
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        key = self._key(key)
+        return (key in self._entries) or \
+            ((self.directory is not None) and os.path.exists(self._path(key)))
+
+    # -- Private methods for keys and files ----------------------------------
+
+    @staticmethod
+    def _key(key):
+        """ Private method that returns the fingerprint of a capacity method,
+        or ``key`` itself if it is already a fingerprint.
+        """
+        if hasattr(key, 'fingerprint'):
+            key = key.fingerprint()
+        if (type(key) is not str) or not re.fullmatch('[0-9a-f]{32}', key):
+            raise ValueError("'{}' is not a valid fingerprint.".format(key))
+
+        return key
+
+    def _path(self, key):
+        return os.path.join(self.directory, self.tag, key + '.npz')
+
+    def _load(self, key):
+        """ Private method that reads stored results. Files written by
+        another version, or with other fields, count as missing.
+
+        Returns:
+            dict: The cache entry, or ``None``.
+        """
+        with np.load(self._path(key)) as data:
+            if ('tag' not in data.files) or (str(data['tag']) != self.tag) \
+                    or (data['results'].dtype != result_dtype):
+                return None
+            return self._entry(data['results'], data['capacity'],
+                               data['plugged'])
+
+    # -- Methods to read and write results -----------------------------------
+
+    def get(self, key):
+        """ Method that returns cached results.
+
+        Args:
+            key (str or class): A fingerprint or a capacity method.
+
+        Returns:
+            dict: The ``results``, ``capacity`` and ``plugged`` of the
+            analysis, or ``None`` if it is not in the cache.
+        """
+        key = self._key(key)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            if self.eviction == 'lru':
+                self._entries.move_to_end(key)
+        elif (self.directory is not None) and os.path.exists(self._path(key)):
+            entry = self._load(key)
+            if entry is not None:
+                self._store(key, entry)
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return entry
+
+    def put(self, key, method):
+        """ Method that stores the results of an analysis.
+
+        Args:
+            key (str or class): A fingerprint or a capacity method.
+            method (class): The capacity method that holds the results.
+
+        Returns:
+            self
+        """
+        key = self._key(key)
+        entry = self._entry(method.results, method.capacity, method.plugged)
+        self._store(key, entry)
+
+        if self.directory is not None:
+            # Write to a temporary file first, so readers never see half a file
+            handle, temp = tempfile.mkstemp(
+                suffix='.npz', dir=os.path.join(self.directory, self.tag))
+            with os.fdopen(handle, 'wb') as f:
+                np.savez(f, tag=np.array(self.tag), **entry)
+            os.replace(temp, self._path(key))
+
+        return self
+
+    @staticmethod
+    def _entry(results, capacity, plugged):
+        """ Private method that builds a read-only cache entry.
+        """
+        results = np.array(results)
+        results.flags.writeable = False
+
+        return {'results': results, 'capacity': float(capacity),
+                'plugged': bool(plugged)}
+
+    def _store(self, key, entry):
+        """ Private method that adds an entry to the memory cache and evicts
+        entries beyond ``maxsize``.
+        """
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while (self.maxsize is not None) and (len(self._entries) >
+                                               self.maxsize):
+            self._entries.popitem(last=False)
+
+    # -- Methods for invalidation --------------------------------------------
+
+    def invalidate(self, key):
+        """ Method that removes one analysis from memory and from disk.
+
+        Args:
+            key (str or class): A fingerprint or a capacity method.
+
+        Returns:
+            self
+        """
+        key = self._key(key)
+        self._entries.pop(key, None)
+        if (self.directory is not None) and os.path.exists(self._path(key)):
+            os.remove(self._path(key))
+
+        return self
+
+    def clear(self, disk=True):
+        """ Method that removes all analyses, including those stored by other
+        versions.
+
+        Args:
+            disk (bool): If false, the on-disk store is kept and only the
+                memory cache is cleared.
+
+        Returns:
+            self
+        """
+        self._entries.clear()
+        if disk and (self.directory is not None):
+            for tag in os.listdir(self.directory):
+                folder = os.path.join(self.directory, tag)
+                if not (re.fullmatch('[0-9a-f]{12}', tag) and
+                        os.path.isdir(folder)):
+                    continue
+                for name in os.listdir(folder):
+                    if re.fullmatch('[0-9a-f]{32}\\.npz', name):
+                        os.remove(os.path.join(folder, name))
+
+        return self
+
+    # -- Method for string representation ------------------------------------
+
+    def __str__(self):
+        return "Result Cache:\n-------------\n" \
+               "In memory: {} of {}\n" \
+               "Directory: {}\n" \
+               "Version tag: {}\n" \
+               "Eviction: {}\n" \
+               "Hits: {}, Misses: {}".format(len(self), self.maxsize,
+                                             self.directory, self.tag,
+                                             self.eviction, self.hits,
+                                             self.misses)
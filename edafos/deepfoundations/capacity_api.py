@@ -1,8 +1,10 @@
-""" Provide the ``Olson 90`` class.
+""" Provide the ``Olson 90`` and ``Revised API`` classes.
 
 """
 
 # -- Imports -----------------------------------------------------------------
+import numpy as np
+import edafos
 from .capacity_base import CapacityMethod
 
 
@@ -17,21 +19,32 @@ class Olson90(CapacityMethod):
 
     # -- Constructor ---------------------------------------------------------
 
-    def __init__(self, project):
+    def __init__(self, project, context=None, lazy=False, cache=None):
         """
         Args:
             project (class): Provide the ``Project`` object as defined in the
                 :class:`~edafos.project.Project` class.
+            context (class): Optional
+                :class:`~edafos.deepfoundations.analysis.AnalysisContext` for
+                ``project``, shared with other capacity methods.
+            lazy (bool): If ``TRUE``, the analysis runs when the results are
+                first read, and again whenever the inputs change.
+            cache (class): Optional
+                :class:`~edafos.deepfoundations.cache.ResultCache` to take
+                results from, or add them to.
         """
-        super().__init__(project=project)
+        super().__init__(project=project, context=context, lazy=lazy,
+                         cache=cache)
 
         self.method_name = 'Olson 90'
+        self._required = ['soil_desc', 'tuw', 'corr_n', 'su']
 
-        # Run pre check
-        self._pre_check(['soil_desc', 'tuw', 'corr_n', 'su'])
+        if not lazy:
+            # Run pre check
+            self._pre_check(self._required)
 
-        # Run analysis
-        self.run()
+            # Run analysis
+            self.run()
 
     # -- Method for shaft resistance -----------------------------------------
     def shaft_res_per_z(self, z1, z2):
@@ -80,106 +93,130 @@ class Olson90(CapacityMethod):
 
         pass
 
-    # -- Method that follows the recipe --------------------------------------
-    def run(self):
-        """ Method where the method "recipe" is compiled and all calculations
-        are performed.
+    # -- Private method for unit resistances ---------------------------------
+
+    def _unit_resistances(self, seg, toe_su=None):
+        """ Private method that applies the Olson 90 rules to all segments at
+        once.
+
+        Args:
+            seg (dict): Segment arrays, as returned by
+                :meth:`~edafos.deepfoundations.capacity_base.CapacityMethod._segment_arrays`.
+            toe_su (float or array): Average toe :math:`s_u` for the end
+                bearing of cohesive segments, one value or one per segment.
+                Defaults to the average at the pile toe.
 
         Returns:
+            tuple: Two arrays (unitless), the unit shaft resistance,
+            :math:`f_s`, per segment and the unit toe resistance,
+            :math:`q_p`, at the bottom of every segment.
+        """
+        # -- Cohesive segments -----------------------------------------------
+        f_s, q_p = self._cohesive_resistances(seg, toe_su)
+
+        # -- Cohesionless segments -------------------------------------------
+        sand = seg['soil_type'] != 'cohesive'
+        if sand.any():
+            corr_n = seg['corr_n'][sand]
+
+            delta, f_lim, n_q, q_lim = self.olson90_table_values(
+                seg['soil_desc'][sand], corr_n)
+
+            # Side Friction
+            if self.project.pile.pile_type in ['pipe-open', 'h-pile']:
+                k = self.lateral_k_olson90(corr_n, False)
+            else:
+                k = self.lateral_k_olson90(corr_n, True)
+            f_s[sand] = np.minimum(
+                self.unit_shaft_res_sand(k, seg['eff_mid'][sand], delta),
+                f_lim)
+
+            # End bearing
+            q_p[sand] = np.minimum(seg['eff_bot'][sand] * n_q, q_lim)
+
+        return f_s, q_p
+
+
+# -- Revised API Class -------------------------------------------------------
+
+class RevisedAPI(CapacityMethod):
+    """ Class to represent the Revised API method (API RP2A) for capacity
+    calculations of driven piles in cohesive and cohesionless soils. For the
+    engineering background refer to the section on the :ref:`api-method`.
+
+    """
+
+    # -- Constructor ---------------------------------------------------------
 
+    def __init__(self, project, context=None, lazy=False, cache=None):
+        """
+        Args:
+            project (class): Provide the ``Project`` object as defined in the
+                :class:`~edafos.project.Project` class.
+            context (class): Optional
+                :class:`~edafos.deepfoundations.analysis.AnalysisContext` for
+                ``project``, shared with other capacity methods.
+            lazy (bool): If ``TRUE``, the analysis runs when the results are
+                first read, and again whenever the inputs change.
+            cache (class): Optional
+                :class:`~edafos.deepfoundations.cache.ResultCache` to take
+                results from, or add them to.
         """
-        # z_list = self._z_for_analysis()
-        z_list = self.project.z_layer_pile()
+        super().__init__(project=project, context=context, lazy=lazy,
+                         cache=cache)
 
-        plugged = True
-        total_r_s_out = 0
-        total_r_s_in = 0
+        self.method_name = 'Revised API'
+        self._required = ['tuw', 'corr_n', 'su']
 
-        for top_z, bot_z in zip(z_list[:-1], z_list[1:]):
-            # Effective stress
-            mid_z = top_z + ((bot_z - top_z)/2)
-            eff_sigma = self.project.sp.calculate_stress(mid_z)
-            bot_sigma = self.project.sp.calculate_stress(bot_z)
+        if not lazy:
+            # Run pre check
+            self._pre_check(self._required)
 
-            # Get soil type (cohesive/cohesionless)
-            soil_type = self.project.sp.get_soil_prop(bot_z, 'soil_type')
+            # Run analysis
+            self.run()
 
-            # Plugged conditions
-            side_area_out = self.project.pile.side_area(top_z, bot_z,
-                                                        box_area=True)
-            toe_area_pl = self.project.pile.xsection_area(bot_z, box_area=True,
-                                                          soil_plug=True)
+    # -- Private method for unit resistances ---------------------------------
 
-            # Unplugged conditions
-            if self.project.pile.pile_type in ['pipe-open', 'h-pile']:
-                side_area_in = self.project.pile.side_area(top_z, bot_z,
-                                                           inside=True)
-                toe_area_upl = self.project.pile.xsection_area(bot_z)
-            else:
-                side_area_in = 0 * self.project.set_units('pile_side_area')
-                toe_area_upl = 0 * self.project.set_units('pile_xarea_alt')
-
-            if soil_type == 'cohesive':
-                # Side Friction
-                su = self.project.sp.get_soil_prop(bot_z, 'su')
-                a_factor = self.a_factor_rev_api(eff_sigma, su)
-                f_s = self.unit_shaft_res_clay(a_factor, su)
-
-                # End bearing
-                toe_su = self.average_toe_su()
-                q_p = self.unit_toe_res_clay(toe_su)
-            else:
-                # Side Friction
-                corr_n = self.project.sp.get_soil_prop(bot_z, 'corr_n')
-                soil_desc = self.project.sp.get_soil_prop(bot_z, 'soil_desc')
-                if self.project.pile.pile_type in ['pipe-open', 'h-pile']:
-                    k = self.lateral_k_olson90(corr_n, False)
-                else:
-                    k = self.lateral_k_olson90(corr_n, True)
-                delta = self.olson90_table(soil_desc, corr_n, 'delta')
-                f_lim = self.olson90_table(soil_desc, corr_n, 'f_lim')
-                f_s = min(self.unit_shaft_res_sand(k, eff_sigma, delta), f_lim)
-
-                # End bearing
-                n_q = self.olson90_table(soil_desc, corr_n, 'N_q')
-                q_lim = self.olson90_table(soil_desc, corr_n, 'q_lim')
-                q_p = min((bot_sigma * n_q), q_lim)
-
-            r_s_out = self.shaft_resistance(f_s, side_area_out)
-            r_s_in = self.shaft_resistance(f_s, side_area_in)
-
-            total_r_s_out = total_r_s_out + r_s_out
-            total_r_s_in = total_r_s_in + r_s_in
-
-            r_p_pl = self.toe_resistance(q_p, toe_area_pl)
-            r_p_upl = self.toe_resistance(q_p, toe_area_upl)
-
-            # Plugged total resistance
-            r_n_pl = total_r_s_out + r_p_pl
-
-            # Unplugged total resistance
-            if self.project.pile.pile_type in ['pipe-open', 'h-pile']:
-                r_n_upl = total_r_s_out + total_r_s_in + r_p_upl
-            else:
-                r_n_upl = 0 + total_r_s_in + r_p_upl
+    def _unit_resistances(self, seg, toe_su=None):
+        """ Private method that applies the Revised API rules to all segments
+        at once.
+
+        Args:
+            seg (dict): Segment arrays, as returned by
+                :meth:`~edafos.deepfoundations.capacity_base.CapacityMethod._segment_arrays`.
+            toe_su (float or array): Average toe :math:`s_u` for the end
+                bearing of cohesive segments, one value or one per segment.
+                Defaults to the average at the pile toe.
+
+        Returns:
+            tuple: Two arrays (unitless), the unit shaft resistance,
+            :math:`f_s`, per segment and the unit toe resistance,
+            :math:`q_p`, at the bottom of every segment.
+        """
+        # -- Cohesive segments -----------------------------------------------
+        f_s, q_p = self._cohesive_resistances(seg, toe_su)
 
-            # Store values in data frame
-            self.tab_results.loc[len(self.tab_results) + 1] = [
-                bot_z, total_r_s_out.magnitude, total_r_s_in.magnitude,
-                r_p_pl.magnitude, r_p_upl.magnitude, r_n_pl.magnitude,
-                r_n_upl.magnitude]
+        # -- Cohesionless segments -------------------------------------------
+        sand = seg['soil_type'] != 'cohesive'
+        if sand.any():
+            delta, f_lim, n_q, q_lim = self.rev_api_table_values(
+                seg['corr_n'][sand])
 
-        max_unplugged = self.tab_results.iloc[:, -1].max()
-        max_pluged = self.tab_results.iloc[:, -2].max()
+            # The guideline limits are in ksf
+            k_stress = (1 * edafos.units.kip / edafos.units.feet ** 2).to(
+                self.project.set_units('stress')).magnitude
 
-        if self.project.pile.pile_type in ['pipe-open', 'h-pile']:
-            if max_unplugged < max_pluged:
-                plugged = False
-            result = min(max_unplugged, max_pluged)
-        else:
-            result = max_pluged
+            # Side Friction
+            if self.project.pile.pile_type in ['pipe-open', 'h-pile']:
+                k = self.lateral_k_rev_api(False)
+            else:
+                k = self.lateral_k_rev_api(True)
+            f_s[sand] = np.minimum(
+                self.unit_shaft_res_sand(k, seg['eff_mid'][sand], delta),
+                f_lim * k_stress)
 
-        self.capacity = result
-        self.plugged = plugged
+            # End bearing
+            q_p[sand] = np.minimum(seg['eff_bot'][sand] * n_q,
+                                   q_lim * k_stress)
 
-        return self
+        return f_s, q_p
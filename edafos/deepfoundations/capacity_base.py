@@ -5,7 +5,109 @@
 # -- Imports -----------------------------------------------------------------
 import numpy as np
 import pandas as pd
-from edafos.data import english_hpiles, olson90_data
+from edafos.data import english_hpiles, olson90_data, api_data
+from edafos.project import _digest
+from .analysis import AnalysisContext, _segments
+
+
+# -- Compiled guideline tables -----------------------------------------------
+
+def _compile_table(data):
+    """ A private helper function that compiles a table of guideline values
+    keyed by soil density (e.g. ``olson90_data['sand']``) into NumPy arrays,
+    so that values for whole arrays of SPT-N are found with a sorted search.
+
+    Args:
+        data (dict): The soil density bands, in order, each with an ``Ncor``
+            range (i.e. '0 - 4' or 'over 50') and the guideline values.
+
+    Returns:
+        dict: The upper SPT-N limit of every band but the last, ``upper``, and
+        one array of values per band for ``delta``, ``f_lim``, ``N_q`` and
+        ``q_lim``.
+    """
+    bands = list(data.values())
+    table = {'upper': np.array([float(i['Ncor'].split('-')[1])
+                                for i in bands[:-1]])}
+    for req in ['delta', 'f_lim', 'N_q', 'q_lim']:
+        table[req] = np.array([i[req] for i in bands], dtype=float)
+
+    return table
+
+
+olson90_tables = {k: _compile_table(v) for k, v in olson90_data.items()}
+api_table = _compile_table(api_data)
+
+
+# -- Result records ----------------------------------------------------------
+
+# Depth, outside and inside shaft, plugged and unplugged toe and nominal
+# resistances, as in the columns of CapacityMethod.tab_results
+result_dtype = np.dtype([(name, float) for name in
+                         ['depth', 'rs_o', 'rs_i', 'rp_p', 'rp_u', 'rn_p',
+                          'rn_u']])
+
+
+# -- PreCheckReport Class ----------------------------------------------------
+
+class PreCheckReport(object):
+    """ Class to represent the outcome of the analysis pre-check of
+    :meth:`~edafos.deepfoundations.capacity_base.CapacityMethod._pre_check`:
+    which layers of the soil profile miss which of the required properties.
+
+    """
+
+    # -- Constructor ---------------------------------------------------------
+
+    def __init__(self, method_name, soil_type, missing):
+        """
+        Args:
+            method_name (str): Name of the capacity method.
+            soil_type (array): Soil type of every layer.
+            missing (dict): Boolean arrays, one value per layer, that are
+                ``TRUE`` where the layer misses the property, keyed by the
+                required properties in the order they were requested.
+        """
+        self.method_name = method_name
+        self.soil_type = soil_type
+        self.missing = missing
+
+        # Layer numbers, as in the index of SoilProfile.layers
+        self.layers = np.arange(1, len(soil_type) + 1)
+
+    # -- Pass or fail --------------------------------------------------------
+
+    @property
+    def passed(self):
+        """ ``TRUE`` if no layer misses a required property.
+        """
+        return not any(mask.any() for mask in self.missing.values())
+
+    def missing_properties(self, layer):
+        """ Method that lists the required properties a layer misses.
+
+        Args:
+            layer (int): The layer number (starting from 1).
+
+        Returns:
+            list: Property names, in the order they were requested.
+        """
+        return [prop for prop, mask in self.missing.items()
+                if mask[layer - 1]]
+
+    # -- Method for string representation ------------------------------------
+
+    def __str__(self):
+        msg = "ANALYSIS PRE-CHECK:\n"
+        incomplete = np.zeros(len(self.layers), dtype=bool)
+        for mask in self.missing.values():
+            incomplete |= mask
+        for i in self.layers[incomplete]:
+            msg = msg + "Layer {} ({}) is missing these properties: " \
+                        "{}\n".format(i, self.soil_type[i - 1],
+                                      self.missing_properties(i))
+
+        return "{} ".format(self.method_name.upper()) + msg
 
 
 # -- CapacityMethod Class ----------------------------------------------------
@@ -18,11 +120,25 @@ class CapacityMethod(object):
 
     # -- Constructor ---------------------------------------------------------
 
-    def __init__(self, project):
+    def __init__(self, project, context=None, lazy=False, cache=None):
         """
         Args:
             project (class): Provide the ``Project`` object as defined in the
                 :class:`~edafos.project.Project` class.
+            context (class): Optional
+                :class:`~edafos.deepfoundations.analysis.AnalysisContext` for
+                ``project``, to reuse its stresses, soil properties and pile
+                areas instead of calculating them again.
+            lazy (bool): If ``TRUE``, the pre-check and the analysis are
+                deferred until :attr:`capacity`, :attr:`plugged`,
+                :attr:`results` or :attr:`tab_results` are first read. The
+                results are then cached, and calculated again only if the
+                project, soil profile or pile change.
+            cache (class): Optional
+                :class:`~edafos.deepfoundations.cache.ResultCache`. Results
+                of analyses with the same fingerprint are taken from the
+                cache instead of being calculated, and new results are added
+                to it.
         """
         # Type check
         if str(type(project)) == "<class 'edafos.project.Project'>":
@@ -30,6 +146,18 @@ class CapacityMethod(object):
         else:
             raise TypeError("Wrong input. Attach `Project` objects only.")
 
+        if context is None:
+            pass
+        elif context.project is not project:
+            raise ValueError("The analysis context was built for a different "
+                             "project.")
+        self.context = context
+        self.lazy = lazy
+        self.cache = cache
+
+        # Required soil properties, checked before every analysis
+        self._required = []
+
         self.method_name = 'Base Capacity Method'
 
         # Create data frame for tabular results
@@ -41,15 +169,116 @@ class CapacityMethod(object):
             col_names = ['Depth (m)', 'Rs_o (kN)', 'Rs_i (kN)',
                          'Rp_p (kN)', 'Rp_u (kN)', 'Rn_p (kN)',
                          'Rn_u (kN)']
-        self.tab_results = pd.DataFrame(columns=col_names)
-        self.capacity = None
-        self.plugged = None
+        self._col_names = col_names
+        self._results = np.empty(0, dtype=result_dtype)
+        self._tab_results = None
+        self._capacity = None
+        self._plugged = None
+
+        # State of the inputs the cached results were calculated for
+        self._run_key = None
+
+        # Own analysis context, when none is given, and the unit resistances
+        # of the last run, to only recalculate segments that changed
+        self._own_context = None
+        self._unit_cache = None
+
+        # Average toe su, for the current state only
+        self._toe_su_cache = (None, None)
+
+        # Capacity curves per step, for the current state only
+        self._curve_cache = (None, {})
+
+    # -- Results -------------------------------------------------------------
+
+    @property
+    def capacity(self):
+        """ The nominal capacity of the pile, in the ``capacity`` units of the
+        project unit system (unitless).
+        """
+        self._update()
+        return self._capacity
+
+    @property
+    def plugged(self):
+        """ ``TRUE`` if the pile capacity is governed by plugged conditions.
+        """
+        self._update()
+        return self._plugged
+
+    @property
+    def results(self):
+        """ Structured NumPy array with the results of the analysis, one
+        record per segment bottom depth. The fields are ``depth``, ``rs_o``,
+        ``rs_i``, ``rp_p``, ``rp_u``, ``rn_p`` and ``rn_u``, in the order of
+        the columns of :attr:`tab_results`.
+        """
+        self._update()
+        return self._results
+
+    @property
+    def tab_results(self):
+        """ Pandas DataFrame with the tabular results of the analysis. It is
+        built from :attr:`results` the first time it is accessed.
+        """
+        self._update()
+        if self._tab_results is None:
+            self._tab_results = pd.DataFrame(
+                {name: self._results[field] for name, field in
+                 zip(self._col_names, self._results.dtype.names)},
+                columns=self._col_names,
+                index=pd.RangeIndex(1, len(self._results) + 1))
+
+        return self._tab_results
+
+    # -- Content fingerprint -------------------------------------------------
+
+    def fingerprint(self):
+        """ Method that returns a fingerprint of the analysis: the capacity
+        method combined with the fingerprint of the project, see
+        :meth:`~edafos.project.Project.fingerprint`. Analyses with the same
+        fingerprint give the same results.
+
+        Returns:
+            str: A 32 character hexadecimal fingerprint.
+        """
+        key = self._state_key()
+        cached = getattr(self, '_fingerprint', None)
+        if (cached is None) or (cached[0] != key):
+            cls = type(self)
+            self._fingerprint = (key, _digest([
+                'CapacityMethod', cls.__module__, cls.__qualname__,
+                self.project.fingerprint()]))
+
+        return self._fingerprint[1]
+
+    # -- Private methods for lazy evaluation ---------------------------------
+
+    def _state_key(self):
+        """ Private method that identifies the state of the project, soil
+        profile and pile that results depend on.
+        """
+        sp = self.project.sp
+        pile = self.project.pile
+
+        return (self.project._revision, id(sp), getattr(sp, '_revision', 0),
+                id(pile), getattr(pile, '_revision', 0))
+
+    def _update(self):
+        """ Private method that runs the pre-check and the analysis of lazy
+        capacity methods if there are no results yet or if the inputs changed
+        since they were calculated.
+        """
+        if self.lazy and (self._run_key != self._state_key()):
+            self._pre_check(self._required)
+            self.run()
 
     # -- Private method for pre-checks ---------------------------------------
-    def _pre_check(self, req):
+    def _pre_check(self, req, verbose=False, raise_errors=True):
         """ Private method that goes through all defined soil and pile
         properties and compares against the requested properties to ensure they
-        are available.
+        are available. All layers are checked at once, with one mask over the
+        layer columns per property.
 
         Pile objects cannot be created without the required properties, hence,
         at the moment this method focuses mostly on soil properties.
@@ -57,9 +286,15 @@ class CapacityMethod(object):
         Args:
             req (list): A list of required properties by their corresponding
                 argument names (i.e. ``[soil_type, tuw, corr_n]``).
+            verbose (bool): If ``TRUE``, a banner is printed when no required
+                properties are missing.
+            raise_errors (bool): If false, the report is returned even if
+                properties are missing.
 
         Returns:
-            pass/fail (TODO- with recommendations for missing properties)
+            PreCheckReport: The missing properties per layer. A
+            ``ValueError`` that lists them is raised instead if any are
+            missing, unless ``raise_errors`` is false.
         """
         # Input check
         if type(req) is not list:
@@ -76,47 +311,161 @@ class CapacityMethod(object):
                                  " {}.".format(prop, allowed))
 
         # Shorthand for convenience
-        df = self.project.sp.layers
+        store = self.project.sp._store
 
         # -- Soil checks -----------------------------------------------------
-        if len(df.index) == 0:
+        if len(store) == 0:
             raise ValueError("No layers in soil profile.")
 
-        # Create an empty dictionary
+        soil_type = store.column('Soil Type')
+        clay = soil_type == 'cohesive'
+        sand = soil_type == 'cohesionless'
+
+        # Missing values per property, where the property applies
         missing = {}
-        for i in df.index:
-            missing[i] = []
-
-        # Loop through layers
-        for i in df.index:
-            for prop in req:
-                if prop == 'tuw':
-                    if np.isnan(df['TUW'][i]):
-                        missing[i].append('tuw')
-                elif prop == 'corr_n':
-                    if df['Soil Type'][i] == 'cohesionless':
-                        if np.isnan(df['Corr. N'][i]):
-                            missing[i].append('corr_n')
-                elif prop == 'su':
-                    if df['Soil Type'][i] == 'cohesive':
-                        if np.isnan(df['Shear Su'][i]):
-                            missing[i].append('su')
-                elif prop == 'soil_desc':  # This accommodates Olson 90 only!!!
-                    if df['Soil Type'][i] == 'cohesionless':
-                        if pd.isnull(df['Soil Desc'][i]):
-                            missing[i].append('soil_desc')
+        for prop in req:
+            if prop == 'tuw':
+                missing[prop] = np.isnan(store.column('TUW'))
+            elif prop == 'corr_n':
+                missing[prop] = sand & np.isnan(store.column('Corr. N'))
+            elif prop == 'su':
+                missing[prop] = clay & np.isnan(store.column('Shear Su'))
+            elif prop == 'soil_desc':  # This accommodates Olson 90 only!!!
+                missing[prop] = sand & pd.isnull(store.column('Soil Desc'))
+
+        report = PreCheckReport(self.method_name, soil_type, missing)
+
+        if not report.passed:
+            if raise_errors:
+                raise ValueError(str(report))
+        elif verbose:
+            print("\n***** {} ANALYSIS PRE-CHECK COMPLETE - NO REQUIRED "
+                  "PROPERTIES MISSING *****\n".format(self.method_name.upper()))
 
-        msg = "ANALYSIS PRE-CHECK:\n"
-        for i in missing:
-            if len(missing[i]) > 0:
-                msg = msg + "Layer {} ({}) is missing these properties: " \
-                            "{}\n".format(i, df['Soil Type'][i], missing[i])
+        return report
+
+    # -- Method that follows the recipe --------------------------------------
+    def run(self):
+        """ Method where the method "recipe" is compiled and all calculations
+        are performed. Every capacity method shares the same segment arrays
+        (stresses, soil properties and pile areas), taken from the analysis
+        context if there is one, and only supplies its own unit resistances.
 
-        if len(msg) > 20:
-            raise ValueError("{} ".format(self.method_name.upper()) + msg)
+        When the analysis runs again after
+        :meth:`~edafos.soil.profile.SoilProfile.update_layer`, the unit
+        resistances are only recalculated for the segments refreshed by the
+        context, plus the cohesive end bearing if the average toe
+        :math:`s_u` changed.
+
+        Returns:
+            self
+        """
+        if self.cache is not None:
+            entry = self.cache.get(self)
+            if entry is not None:
+                self._results = entry['results']
+                self._tab_results = None
+                self._capacity = entry['capacity']
+                self._plugged = entry['plugged']
+                self._run_key = self._state_key()
+                return self
+
+        if self.context is None:
+            # A private context, refreshed on every run
+            if self._own_context is None:
+                self._own_context = AnalysisContext(self.project)
+            context = self._own_context.refresh()
+        elif self.context.is_current():
+            context = self.context
         else:
-            print("\n***** {} ANALYSIS PRE-CHECK COMPLETE - NO REQUIRED "
-                  "PROPERTIES MISSING *****\n".format(self.method_name.upper()))
+            raise ValueError("The analysis context is out of date. The soil "
+                             "profile or pile changed since it was built.")
+        seg = context.segments
+
+        clay = seg['soil_type'] == 'cohesive'
+        toe_su = self.average_toe_su(with_units=False) if clay.any() else None
+
+        # Segments with new inputs since the last run
+        cache = self._unit_cache
+        changed = None
+        if (cache is not None) and (cache['context'] is context):
+            changed = context._changed_since(cache['key'])
+        if changed is not None:
+            new = np.asarray(toe_su, dtype=float)
+            old = np.asarray(cache['toe_su'], dtype=float)
+            if not ((new == old) | (np.isnan(new) & np.isnan(old))).all():
+                changed = changed | clay
+
+        if changed is None:
+            f_s, q_p = self._unit_resistances(seg, toe_su)
+        else:
+            f_s, q_p = cache['f_s'].copy(), cache['q_p'].copy()
+            if changed.any():
+                f_s[changed], q_p[changed] = self._unit_resistances(
+                    {k: v[changed] for k, v in seg.items()}, toe_su)
+
+        self._unit_cache = {'context': context, 'key': context._key,
+                            'toe_su': toe_su, 'f_s': f_s, 'q_p': q_p}
+        self._assemble_results(seg, f_s, q_p)
+
+        if self.cache is not None:
+            self.cache.put(self, self)
+
+        return self
+
+    # -- Private method for unit resistances ---------------------------------
+
+    def _unit_resistances(self, seg, toe_su=None):
+        """ Private method that returns the unit shaft and toe resistances for
+        all segments at once. Every capacity method implements its own rules.
+
+        Args:
+            seg (dict): Segment arrays, as returned by
+                :meth:`~edafos.deepfoundations.capacity_base.CapacityMethod._segment_arrays`.
+            toe_su (float or array): Average toe :math:`s_u` for the end
+                bearing of cohesive segments, one value or one per segment.
+                Defaults to the average at the pile toe.
+
+        Returns:
+            tuple: Two arrays (unitless), the unit shaft resistance,
+            :math:`f_s`, per segment and the unit toe resistance,
+            :math:`q_p`, at the bottom of every segment.
+        """
+        raise NotImplementedError("'{}' does not define unit resistances."
+                                  "".format(self.method_name))
+
+    def _cohesive_resistances(self, seg, toe_su=None):
+        """ Private method that returns unit resistance arrays with the
+        cohesive segments filled in with the Revised API rules, equations
+        :eq:`f_s-api-clay` and :eq:`q_p-api-clay`, and ``NaN`` elsewhere.
+
+        Args:
+            seg (dict): Segment arrays, as returned by
+                :meth:`~edafos.deepfoundations.capacity_base.CapacityMethod._segment_arrays`.
+            toe_su (float or array): Average toe :math:`s_u`, one value or one
+                per segment. Defaults to the average at the pile toe.
+
+        Returns:
+            tuple: Two arrays (unitless), :math:`f_s` and :math:`q_p`.
+        """
+        f_s = np.full(len(seg['bot']), np.nan)
+        q_p = np.full(len(seg['bot']), np.nan)
+
+        clay = seg['soil_type'] == 'cohesive'
+        if clay.any():
+            su = seg['su'][clay]
+
+            # Side Friction
+            a_factor = self.a_factor_rev_api(seg['eff_mid'][clay], su)
+            f_s[clay] = self.unit_shaft_res_clay(a_factor, su)
+
+            # End bearing
+            if toe_su is None:
+                toe_su = self.average_toe_su(with_units=False)
+            toe_su = np.broadcast_to(toe_su, q_p.shape)[clay]
+            q_p[clay] = self.unit_toe_res_clay(toe_su)
+
+        return f_s, q_p
 
     # -- Private method for expanded list of z's -----------------------------
 
@@ -133,7 +482,7 @@ class CapacityMethod(object):
                 at the bottom, the second list is at mid point for average
                 effective stress calculations.
         """
-        last_z = self.project.sp.layers['Depth'].max()
+        last_z = self.project.sp._store.column('Depth')[-1]
         if self.project.unit_system == 'SI':
             iz = list(np.arange(0, last_z, 0.2))
         else:
@@ -153,6 +502,286 @@ class CapacityMethod(object):
         # return z_list, [0.0] + mid_z_list
         return z_list
 
+    # -- Private method for segment arrays -----------------------------------
+
+    def _segment_arrays(self, z_list):
+        """ Private method that gathers, as NumPy arrays, everything the
+        capacity methods need for every segment defined by consecutive depths
+        in ``z_list``: stresses, soil properties and pile areas. All values
+        are unitless, in the units of the project unit system.
+
+        Args:
+            z_list (list): Sorted depths of the segment boundaries, i.e. the
+                output of :meth:`~edafos.project.Project.z_layer_pile`.
+
+        Returns:
+            dict: Arrays with one value per segment, keyed by ``top``,
+            ``bot``, ``mid``, ``eff_mid`` (effective stress at midpoint),
+            ``eff_bot`` (effective stress at bottom), ``layer`` (zero-based
+            position of the soil layer), ``soil_type``, ``soil_desc``,
+            ``corr_n``, ``su`` and the pile areas of
+            :meth:`~edafos.deepfoundations.piles.Pile.segment_areas`.
+        """
+        z = np.asarray(z_list, dtype=float)
+
+        return self._segments(z[:-1], z[1:])
+
+    def _segments(self, top, bot, geometry=None):
+        """ Private method behind
+        :meth:`~edafos.deepfoundations.capacity_base.CapacityMethod._segment_arrays`
+        for segments given by their top and bottom depths, which need not be
+        consecutive.
+
+        Args:
+            top (array): Depths to the top of the segments (unitless).
+            bot (array): Depths to the bottom of the segments (unitless).
+            geometry (PileGeometry): Pile geometry to use instead of the
+                pile's own.
+
+        Returns:
+            dict: Same as ``_segment_arrays``.
+        """
+        return _segments(self.project, top, bot, geometry)
+
+    # -- Private method that assembles the results ---------------------------
+
+    def _assemble_results(self, seg, f_s, q_p):
+        """ Private method that turns unit shaft and toe resistances per
+        segment into cumulative shaft, toe and total resistances, stores them
+        in :attr:`results` and sets :attr:`capacity` and
+        :attr:`plugged`.
+
+        Args:
+            seg (dict): Segment arrays, as returned by
+                :meth:`~edafos.deepfoundations.capacity_base.CapacityMethod._segment_arrays`.
+            f_s (array): Unit shaft resistance per segment (unitless).
+            q_p (array): Unit toe resistance at the bottom of every segment
+                (unitless).
+
+        Returns:
+            self
+        """
+        open_pile = self.project.pile.pile_type in ['pipe-open', 'h-pile']
+
+        total_r_s_out = np.cumsum(self.shaft_resistance(f_s, seg['side_out']))
+        total_r_s_in = np.cumsum(self.shaft_resistance(f_s, seg['side_in']))
+
+        r_p_pl = self.toe_resistance(q_p, seg['toe_plugged'])
+        r_p_upl = self.toe_resistance(q_p, seg['toe_unplugged'])
+
+        # Plugged total resistance
+        r_n_pl = total_r_s_out + r_p_pl
+
+        # Unplugged total resistance
+        if open_pile:
+            r_n_upl = total_r_s_out + total_r_s_in + r_p_upl
+        else:
+            r_n_upl = 0 + total_r_s_in + r_p_upl
+
+        # Store values in a preallocated array, the data frame is lazy
+        results = np.empty(len(seg['bot']), dtype=result_dtype)
+        for name, values in zip(results.dtype.names,
+                                [seg['bot'], total_r_s_out, total_r_s_in,
+                                 r_p_pl, r_p_upl, r_n_pl, r_n_upl]):
+            results[name] = values
+        self._results = results
+        self._tab_results = None
+
+        max_unplugged = float(np.nanmax(r_n_upl))
+        max_pluged = float(np.nanmax(r_n_pl))
+
+        plugged = True
+        if open_pile:
+            if max_unplugged < max_pluged:
+                plugged = False
+            result = min(max_unplugged, max_pluged)
+        else:
+            result = max_pluged
+
+        self._capacity = result
+        self._plugged = plugged
+        self._run_key = self._state_key()
+
+        return self
+
+    # -- Method for capacity vs penetration depth ---------------------------
+
+    def capacity_curve(self, depths):
+        """ Method that calculates the nominal resistances of the pile for a
+        range of penetration depths in a single pass. The pile head stays
+        where it is and the pile is extended (or shortened) so that its toe
+        reaches every depth in ``depths``.
+
+        Shaft resistance is accumulated once over the segments of the soil
+        profile; only the last, partial segment above every toe and the toe
+        resistance (including the average toe :math:`s_u`) are evaluated per
+        depth. Every row matches the toe row of :attr:`tab_results` of a full
+        analysis with the pile toe at that depth.
+
+        Args:
+            depths (array_like): Candidate pile toe depths, measured from the
+                top of the soil profile. They must lie below the pile head and
+                within the soil profile. Only prismatic piles are supported.
+
+                - For **SI**: Enter depths in **meters**.
+                - For **English**: Enter depths in **feet**.
+
+        Returns:
+            DataFrame: One row per depth, with the columns of
+            :attr:`tab_results` followed by the governing nominal resistance,
+            :math:`R_n`, which accounts for plugging as in the full analysis.
+        """
+        pile = self.project.pile
+        sp = self.project.sp
+        depths = np.asarray(depths, dtype=float).ravel()
+
+        head = pile.pen_depth.magnitude - pile.length.magnitude
+        if np.any(depths <= max(head, 0)):
+            raise ValueError("Pile toe depths must be below the pile head and "
+                             "the ground surface.")
+        geometry = pile.geometry.extended(depths.max() - head)
+
+        # Breakpoints other than the pile toe, as in Project.z_layer_pile
+        wt = max(sp.water_table.magnitude, 0)
+        base = sp.z_of_layers() + [wt] + ([head] if head > 0 else [])
+        base = np.unique(base)
+
+        # Cumulative shaft resistance down to every breakpoint
+        seg = self._segments(base[:-1], base[1:], geometry)
+        f_s, _ = self._unit_resistances(seg, toe_su=np.nan)
+        cum_out = np.concatenate([[0], np.cumsum(
+            self.shaft_resistance(f_s, seg['side_out']))])
+        cum_in = np.concatenate([[0], np.cumsum(
+            self.shaft_resistance(f_s, seg['side_in']))])
+
+        # Partial segments from the last breakpoint above every toe
+        j = np.searchsorted(base, depths, side='left') - 1
+        toe = self._segments(base[j], depths, geometry)
+        toe_su = self.average_toe_su_at(depths, with_units=False)
+        f_s, q_p = self._unit_resistances(toe, toe_su=toe_su)
+
+        r_s_out = cum_out[j] + self.shaft_resistance(f_s, toe['side_out'])
+        r_s_in = cum_in[j] + self.shaft_resistance(f_s, toe['side_in'])
+        r_p_pl = self.toe_resistance(q_p, toe['toe_plugged'])
+        r_p_upl = self.toe_resistance(q_p, toe['toe_unplugged'])
+
+        r_n_pl = r_s_out + r_p_pl
+        if pile.pile_type in ['pipe-open', 'h-pile']:
+            r_n_upl = r_s_out + r_s_in + r_p_upl
+            r_n = np.fmin(r_n_pl, r_n_upl)
+        else:
+            r_n_upl = 0 + r_s_in + r_p_upl
+            r_n = r_n_pl
+
+        columns = list(self._col_names)
+        columns.append(columns[-1].replace('Rn_u', 'Rn'))
+
+        return pd.DataFrame(
+            np.column_stack([depths, r_s_out, r_s_in, r_p_pl, r_p_upl,
+                             r_n_pl, r_n_upl, r_n]),
+            columns=columns, index=pd.RangeIndex(1, len(depths) + 1))
+
+    # -- Method for the minimum penetration depth ---------------------------
+
+    def min_pen_depth(self, resistance, step=0.5, tol=1e-4, with_units=True):
+        """ Method that finds the shortest penetration depth at which the
+        nominal resistance of the pile, as in
+        :meth:`~edafos.deepfoundations.capacity_base.CapacityMethod.capacity_curve`,
+        reaches ``resistance``. The pile head stays where it is.
+
+        The capacity curve is evaluated once on a grid of the soil profile
+        breakpoints and every ``step``, and cached. The first grid interval
+        where the curve crosses ``resistance`` is then refined by bisection.
+        Depths where the resistance is undefined (``NaN``, e.g. missing
+        :math:`s_u` below the toe) do not count as reaching it.
+
+        Args:
+            resistance (float or Quantity): Required nominal resistance.
+
+                - For **SI**: Enter resistance in **kN**.
+                - For **English**: Enter resistance in **kip**.
+
+            step (float): Spacing of the search grid, in project length units.
+            tol (float): Depth tolerance of the bisection, in project length
+                units.
+            with_units (bool): If false, the numerical value is returned in
+                the ``length`` units of the project unit system.
+
+        Returns:
+            Quantity: The minimum penetration depth.
+        """
+        if hasattr(resistance, 'units'):
+            resistance = resistance.to(
+                self.project.set_units('capacity')).magnitude
+
+        depths, r_n = self._cached_curve(step)
+
+        # First grid depth that reaches the required resistance
+        with np.errstate(invalid='ignore'):
+            hit = np.flatnonzero(r_n >= resistance)
+        if hit.size == 0:
+            raise ValueError("The required resistance is not reached within "
+                             "the soil profile.")
+        hit = hit[0]
+
+        if hit == 0:
+            low, high = max(self.project.pile.pen_depth.magnitude -
+                            self.project.pile.length.magnitude, 0), depths[0]
+        else:
+            low, high = depths[hit - 1], depths[hit]
+
+        # Bisection on the crossing interval
+        while high - low > tol:
+            mid = low + (high - low) / 2
+            r_mid = self.capacity_curve([mid]).iloc[0, -1]
+            if r_mid >= resistance:
+                high = mid
+            else:
+                low = mid
+
+        # A plain float, so that it can be used as a pile input
+        high = float(high)
+        if with_units:
+            high = high * self.project.set_units('length')
+
+        return high
+
+    # -- Private method for the cached capacity curve ------------------------
+
+    def _cached_curve(self, step):
+        """ Private method that returns the governing nominal resistance on
+        a grid of depths between the pile head (or ground surface) and the
+        bottom of the soil profile. The grid holds the soil profile
+        breakpoints and points every ``step``. Results are cached until the
+        pile head or the soil profile change.
+
+        Args:
+            step (float): Grid spacing, in project length units.
+
+        Returns:
+            tuple: Two arrays, the depths and the governing nominal
+            resistance at each depth.
+        """
+        pile = self.project.pile
+        sp = self.project.sp
+        head = pile.pen_depth.magnitude - pile.length.magnitude
+        # Curves of earlier states are dropped
+        key = self._state_key()
+        if self._curve_cache[0] != key:
+            self._curve_cache = (key, {})
+        curves = self._curve_cache[1]
+
+        if step not in curves:
+            top = max(head, 0)
+            bottom = sp._store.column('Depth')[-1]
+            grid = np.concatenate([sp.z_of_layers(),
+                                   np.arange(top, bottom, step), [bottom]])
+            grid = np.unique(grid[grid > top])
+            curve = self.capacity_curve(grid)
+            curves[step] = (grid, curve.iloc[:, -1].values)
+
+        return curves[step]
+
     # -- Method for shaft resistance (general) -------------------------------
     @staticmethod
     def shaft_resistance(fs, area):
@@ -207,14 +836,19 @@ class CapacityMethod(object):
         soils, as per equation :eq:`a-rev-api-clay`.
 
         Args:
-            sigma (float): average effective stress
-            su (float): undrained shear strength of soil
+            sigma (float or array): average effective stress
+            su (float or array): undrained shear strength of soil
 
         Returns:
             float or dimensionless Quantity: The :math:`\\alpha` factor
         """
         psi = su / sigma
-        if psi <= 1:
+        if np.ndim(psi) > 0:
+            with np.errstate(divide='ignore'):
+                alpha = np.where(psi <= 1, 0.5 * (psi ** -0.5),
+                                 0.5 * (psi ** -0.25))
+            return np.clip(alpha, 0.0, 1.0)
+        elif psi <= 1:
             alpha = max(0.0, (min(0.5 * (psi ** -0.5), 1.0)))
         else:
             alpha = max(0.0, (min(0.5 * (psi ** -0.25), 1.0)))
@@ -240,18 +874,96 @@ class CapacityMethod(object):
         return 9 * su
 
     # -- Method for average toe su (cohesive) --------------------------------
-    def average_toe_su(self):
+    def average_toe_su(self, with_units=True):
         """ API RP2A guidelines, as also shown in equation :eq:`q_p-api-clay`,
         recommend that for bearing capacity calculations, the undrained shear
         strength, :math:`s_u`, should be taken as the average over a distance
         of two pile diameters below the tip of the pile. This method calculates
         this average if there is available information.
 
+        The average only depends on the pile toe and the soil profile, so it
+        is calculated once and reused until either of them changes.
+
+        Args:
+            with_units (bool): If false, the numerical value is returned in
+                the ``stress`` units of the project unit system.
+
         Returns:
             Quantity: Average
         """
+        pile = self.project.pile
+        sp = self.project.sp
+        key = self._state_key()
+        if self._toe_su_cache[0] != key:
+            self._toe_su_cache = (key, self.average_toe_su_at(
+                [pile.pen_depth.magnitude], with_units=False)[0])
+
+        average = self._toe_su_cache[1]
+        if with_units:
+            average = average * self.project.set_units('stress')
+
+        return average
+
+    # -- Method for average toe su at many toe depths ------------------------
+    def average_toe_su_at(self, toe_z, with_units=True):
+        """ Method that calculates the average undrained shear strength,
+        :math:`s_u`, over two pile diameters below a number of candidate toe
+        depths, as in
+        :meth:`~edafos.deepfoundations.capacity_base.CapacityMethod.average_toe_su`.
+        All the averaging windows are evaluated together in a single
+        vectorized pass, which keeps capacity-vs-depth calculations cheap.
+
+        Args:
+            toe_z (array_like): Candidate pile toe depths, measured from the
+                top of the soil profile.
+
+                - For **SI**: Enter depths in **meters**.
+                - For **English**: Enter depths in **feet**.
+
+            with_units (bool): If false, the numerical values are returned in
+                the ``stress`` units of the project unit system.
+
+        Returns:
+            Quantity: Array of averages, one per toe depth. The average is
+            ``NaN`` when it includes a layer without :math:`s_u`.
+        """
+        toe = np.asarray(toe_z, dtype=float)
+        stop = self._two_d_z(toe * self.project.set_units('length')).magnitude
+        stop = np.broadcast_to(stop, toe.shape)
+
+        # Same grid as np.arange(toe, stop, 0.2) for every toe
+        n = np.ceil((stop - toe) / 0.2).astype(int)
+        step = (toe + 0.2) - toe
+        k = np.arange(n.max() if n.size else 0)
+        points = toe[:, None] + k[None, :] * step[:, None]
+
+        # Points below the soil profile are not counted
+        depths = self.project.sp._store.column('Depth')
+        valid = (k[None, :] < n[:, None]) & (points <= depths[-1])
+
+        ix = np.searchsorted(depths, np.where(valid, points, 0.))
+        su = np.where(valid, self.project.sp._store.column('Shear Su')[ix], 0.)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            average = su.sum(axis=1) / valid.sum(axis=1)
+
+        if with_units:
+            average = average * self.project.set_units('stress')
+
+        return average
+
+    # -- Private method for the depth two diameters below the toe ------------
+    def _two_d_z(self, toe_z):
+        """ Private method that returns the depth two pile diameters below
+        the pile toe, the lower limit of the :math:`s_u` average.
+
+        Args:
+            toe_z (Quantity): Pile toe depth(s).
+
+        Returns:
+            Quantity: Depth(s) two pile diameters below ``toe_z``.
+        """
         # TODO: What about tapered piles?
-        toe_z = self.project.pile.pen_depth
         pile_side = self.project.pile.side
         pile_diameter = self.project.pile.diameter
         pile_shape = self.project.pile.shape
@@ -269,19 +981,7 @@ class CapacityMethod(object):
                 # TODO: n = 5 here is not correct, must fix for hex and octa
                 two_d_z = toe_z + 2 * (pile_side/np.tan(np.pi/5))
 
-        two_d_range = np.arange(toe_z.magnitude, two_d_z.magnitude, 0.2)
-
-        count = 0
-        added = 0
-        for i in two_d_range:
-            try:
-                su = self.project.sp.get_soil_prop(i, 'su')
-                added = added + su
-                count = count + 1
-            except ValueError:
-                pass
-
-        return added / count
+        return two_d_z
 
     # -- Method for unit shaft resistance (cohesionless) ---------------------
     @staticmethod
@@ -360,7 +1060,7 @@ class CapacityMethod(object):
         return k
 
     # -- Method that returns Olson 90 guidelines -----------------------------
-    def olson90_table(self, soil_desc, corr_n, req):
+    def olson90_table(self, soil_desc, corr_n, req, with_units=True):
         """ Method that returns Olson 90 values for :math:`\\delta`,
         :math:`f_{s.lim}`, :math:`N_q` and :math:`q_{p.lim}`. Refer to
         :numref:`Olson90_table` for more details.
@@ -386,6 +1086,9 @@ class CapacityMethod(object):
                 - ``q_lim``: for the limiting unit toe resistance,
                   :math:`q_{p.lim}`.
 
+            with_units (bool): If false, the numerical value is returned in
+                the units of the project unit system.
+
         Returns:
             Quantity or float: The value requested for the given conditions.
 
@@ -400,58 +1103,72 @@ class CapacityMethod(object):
             raise ValueError("'{}' not a valid input for `req`. Valid inputs "
                              "are {}.".format(req, allowed_req))
 
-        if soil_desc in ['gravel', 'sand-gravel']:
-            if 0 <= corr_n <= 4:
-                res = olson90_data[soil_desc]['very_loose'][req]
-            elif 5 <= corr_n <= 10:
-                res = olson90_data[soil_desc]['loose'][req]
-            elif 11 <= corr_n <= 30:
-                res = olson90_data[soil_desc]['medium'][req]
-            else:
-                res = olson90_data[soil_desc]['dense'][req]
-        elif soil_desc == 'sand':
-            if 0 <= corr_n <= 4:
-                res = olson90_data[soil_desc]['very_loose'][req]
-            elif 5 <= corr_n <= 10:
-                res = olson90_data[soil_desc]['loose'][req]
-            elif 11 <= corr_n <= 30:
-                res = olson90_data[soil_desc]['medium'][req]
-            elif 31 <= corr_n <= 50:
-                res = olson90_data[soil_desc]['dense'][req]
-            elif 51 <= corr_n <= 100:
-                res = olson90_data[soil_desc]['very_dense'][req]
-            else:
-                res = olson90_data[soil_desc]['very_dense+'][req]
-        elif soil_desc == 'sand-silt':
-            if 0 <= corr_n <= 4:
-                res = olson90_data[soil_desc]['very_loose'][req]
-            elif 5 <= corr_n <= 10:
-                res = olson90_data[soil_desc]['loose'][req]
-            elif 11 <= corr_n <= 30:
-                res = olson90_data[soil_desc]['medium'][req]
-            elif 31 <= corr_n <= 50:
-                res = olson90_data[soil_desc]['dense'][req]
-            elif 51 <= corr_n <= 100:
-                res = olson90_data[soil_desc]['very_dense'][req]
-            elif 101 <= corr_n <= 200:
-                res = olson90_data[soil_desc]['very_dense+'][req]
-            else:
-                res = olson90_data[soil_desc]['very_dense++'][req]
-        else:  # silt
-            if 0 <= corr_n <= 4:
-                res = olson90_data[soil_desc]['very_loose'][req]
-            elif 5 <= corr_n <= 10:
-                res = olson90_data[soil_desc]['loose'][req]
-            elif 11 <= corr_n <= 30:
-                res = olson90_data[soil_desc]['medium'][req]
-            elif 31 <= corr_n <= 50:
-                res = olson90_data[soil_desc]['dense'][req]
-            else:
-                res = olson90_data[soil_desc]['very_dense'][req]
+        table = olson90_tables[soil_desc]
+        res = table[req][np.searchsorted(table['upper'], corr_n)]
 
-        if req in ['f_lim', 'q_lim']:
+        if not with_units:
+            pass
+        elif req in ['f_lim', 'q_lim']:
             res = res * self.project.set_units('stress')
         elif req == 'delta':
             res = res * self.project.set_units('degrees')
 
         return res
+
+    # -- Method that returns Olson 90 guidelines for arrays ------------------
+    @staticmethod
+    def olson90_table_values(soil_desc, corr_n):
+        """ Vectorized version of
+        :meth:`~edafos.deepfoundations.capacity_base.CapacityMethod.olson90_table`
+        that returns all four Olson 90 values for arrays of soil descriptions
+        and SPT-N values at once. Refer to :numref:`Olson90_table` for more
+        details.
+
+        Args:
+            soil_desc (array_like): Descriptions of soil material, same
+                permissible inputs as
+                :meth:`~edafos.deepfoundations.capacity_base.CapacityMethod.olson90_table`.
+            corr_n (array_like): SPT-N corrected values, :math:`K_{cor}`.
+
+        Returns:
+            tuple: Four arrays (unitless) aligned with the inputs, for
+            :math:`\\delta` (degrees), :math:`f_{s.lim}`, :math:`N_q` and
+            :math:`q_{p.lim}`.
+        """
+        soil_desc = np.asarray(soil_desc, dtype=object)
+        corr_n = np.asarray(corr_n, dtype=float)
+
+        res = [np.empty(corr_n.shape) for _ in range(4)]
+        for desc in set(soil_desc.ravel()):
+            if desc not in olson90_tables:
+                raise ValueError("'{}' not a valid input for `soil_desc`. "
+                                 "Valid inputs are {}."
+                                 "".format(desc, list(olson90_tables)))
+            at = soil_desc == desc
+            table = olson90_tables[desc]
+            ix = np.searchsorted(table['upper'], corr_n[at])
+            for values, req in zip(res, ['delta', 'f_lim', 'N_q', 'q_lim']):
+                values[at] = table[req][ix]
+
+        return tuple(res)
+
+    # -- Method that returns Revised API guidelines for arrays ---------------
+    @staticmethod
+    def rev_api_table_values(corr_n):
+        """ Method that returns the Revised API values for :math:`\\delta`,
+        :math:`f_{s.lim}`, :math:`N_q` and :math:`q_{p.lim}` for arrays of
+        SPT-N values, as consolidated in :numref:`API_d_q_SPT_table`.
+
+        Args:
+            corr_n (array_like): SPT-N corrected values, :math:`K_{cor}`.
+
+        Returns:
+            tuple: Four arrays (unitless) aligned with ``corr_n``, for
+            :math:`\\delta` (degrees), :math:`f_{s.lim}` (ksf), :math:`N_q`
+            and :math:`q_{p.lim}` (ksf).
+        """
+        ix = np.searchsorted(api_table['upper'], np.asarray(corr_n,
+                                                            dtype=float))
+
+        return tuple(api_table[req][ix]
+                     for req in ['delta', 'f_lim', 'N_q', 'q_lim'])
@@ -3,7 +3,6 @@
 """
 
 # -- Imports -----------------------------------------------------------------
-from edafos.viz import LoadTestPlot
 import pandas as pd
 from edafos import set_units
 
@@ -109,6 +108,9 @@ class LoadTest(object):
         Returns:
             A load test plot.
         """
+        # The plotting stack is only imported when a plot is requested
+        from edafos.viz import LoadTestPlot
+
         p = LoadTestPlot(unit_system=self.unit_system,
                          library=library,
                          web_embed=web_embed,
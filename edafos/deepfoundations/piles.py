@@ -5,7 +5,9 @@
 # -- Imports -----------------------------------------------------------------
 from edafos.project import Project
 from edafos.data import english_hpiles, si_hpiles
+from ._geometry import PileGeometry
 import numpy as np
+import copy
 
 
 # -- SoilProfile Class -------------------------------------------------------
@@ -124,6 +126,9 @@ class Pile(Project):
                                      "allowed attributes are: {}"
                                      "".format(key, allowed_keys))
 
+        # Keep the input for rebuilding the pile, e.g. in other processes
+        self._init_kwargs = copy.deepcopy(kwargs)
+
         # -- Check for valid pile type ---------------------------------------
         self.pile_type = kwargs.get('pile_type', None)
         allowed_piles = ['concrete', 'pipe-open', 'pipe-closed', 'h-pile',
@@ -492,6 +497,93 @@ class Pile(Project):
             else:
                 pass
 
+        # -- Precompiled geometry --------------------------------------------
+        self._geometry = PileGeometry(self)
+        self._geometry_revision = self._revision
+
+    # -- Precompiled geometry ------------------------------------------------
+
+    @property
+    def geometry(self):
+        """ The :class:`~edafos.deepfoundations._geometry.PileGeometry` of the
+        pile. It is compiled when the pile is created and again only if pile
+        properties are assigned new values.
+        """
+        if self._geometry_revision != self._revision:
+            self._geometry = PileGeometry(self)
+            self._geometry_revision = self._revision
+
+        return self._geometry
+
+    # -- Content fingerprint (private parts) ---------------------------------
+
+    # Dimensional properties and their dimensionality
+    _fingerprint_dims = [('side', 'pile_diameter'),
+                         ('diameter', 'pile_diameter'),
+                         ('thickness', 'pile_diameter'),
+                         ('length', 'pile_length'),
+                         ('pen_depth', 'pile_length'),
+                         ('nf_zone', 'pile_length'),
+                         ('modulus', 'modulus')]
+
+    def _fingerprint_key(self):
+        return (self._revision,)
+
+    def _fingerprint_parts(self):
+        """ Private method that lists the content of the pile for
+        :meth:`~edafos.project.Project.fingerprint`: the unit system, type,
+        shape, dimensions, taper and modulus. Dimensions are converted to the
+        units of the unit system, so the same pile entered in other units has
+        the same fingerprint.
+        """
+        parts = ['Pile', self.unit_system, self.pile_type, self.shape]
+        for name, dim in self._fingerprint_dims:
+            value = getattr(self, name)
+            if value is not None:
+                value = value.to(self.set_units(dim)).magnitude
+            parts += [name, value]
+
+        parts.append('taper_dims')
+        if self.taper_dims is None:
+            parts.append(None)
+        else:
+            parts.append([
+                [d.to(self.set_units('pile_diameter')).magnitude,
+                 l.to(self.set_units('pile_length')).magnitude]
+                for d, l in self.taper_dims])
+
+        return parts
+
+    # -- Private method for the current construction kwargs -----------------
+
+    def _current_kwargs(self):
+        """ Private method that returns keyword arguments that construct a
+        pile equal to this one as it is now, including properties assigned
+        after the pile was created, e.g. a new ``pen_depth``. The pile type
+        and shape are those the pile was created with.
+
+        Returns:
+            dict: Keyword arguments for ``Pile``, in the units of the unit
+            system.
+        """
+        def raw(value, dim):
+            # Divide by the unit, some units are scaled, e.g. 10e9 * pascal
+            return float((value / self.set_units(dim)).to(
+                'dimensionless').magnitude)
+
+        kwargs = {key: self._init_kwargs[key] for key in
+                  ['pile_type', 'shape'] if key in self._init_kwargs}
+        for name, dim in self._fingerprint_dims:
+            value = getattr(self, name)
+            kwargs[name] = None if value is None else raw(value, dim)
+
+        if self.taper_dims is not None:
+            kwargs['taper_dims'] = [[raw(d, 'pile_diameter'),
+                                     raw(l, 'pile_length')]
+                                    for d, l in self.taper_dims]
+
+        return kwargs
+
     # -- Static method for rectangle area ------------------------------------
 
     @staticmethod
@@ -538,7 +630,7 @@ class Pile(Project):
 
     # -- Private method for pile a/d at z ------------------------------------
 
-    def _pile_a_d(self, z):
+    def _pile_a_d(self, z, with_units=True):
         """ A private method that returns the side, :math:`a`, or diameter,
         :math:`d`, of a pile at a depth :math:`z`.
 
@@ -552,51 +644,22 @@ class Pile(Project):
                 - For **SI**: Enter depth, *z*, in **meters**.
                 - For **English**: Enter depth, *z*, in **feet**.
 
+            with_units (bool): If false, the numerical value is returned in
+                the ``pile_diameter`` units of the project unit system.
+
         Returns:
             Quantity: Side :math:`a`, or diameter, :math:`d`.
         """
-        z = z * self.set_units('length')
-        # The length x from the top of the pile is defined as
-        x = self.length - self.pen_depth + z
-
-        if self.pile_type == 'concrete':
-            if self.shape in ['square-solid', 'square-hollow', 'hexagon',
-                              'octagon']:
-                if self.taper_dims is None:
-                    di = [self.side.magnitude, self.side.magnitude]
-                    li = [0, self.length.magnitude]
-                else:
-                    di = [self.side.magnitude] + [i[0].magnitude for i in
-                                                  self.taper_dims]
-                    li = [0] + [i[1].magnitude for i in self.taper_dims]
-                    li = np.cumsum(li)
-            else:
-                if self.taper_dims is None:
-                    di = [self.diameter.magnitude, self.diameter.magnitude]
-                    li = [0, self.length.magnitude]
-                else:
-                    di = [self.diameter.magnitude] + [i[0].magnitude for i in
-                                                      self.taper_dims]
-                    li = [0] + [i[1].magnitude for i in self.taper_dims]
-                    li = np.cumsum(li)
-        elif self.pile_type in ['pipe-open', 'pipe-closed']:
-            di = [self.diameter.magnitude, self.diameter.magnitude]
-            li = [0, self.length.magnitude]
-        else:  # Timber and cast-in-place piles
-            if self.taper_dims is None:
-                di = [self.diameter.magnitude, self.diameter.magnitude]
-                li = [0, self.length.magnitude]
-            else:
-                di = [self.diameter.magnitude] + [i[0].magnitude for i in
-                                                  self.taper_dims]
-                li = [0] + [i[1].magnitude for i in self.taper_dims]
-                li = np.cumsum(li)
+        a_d = self.geometry.a_d(self._x_of_z(z))
+        if with_units:
+            a_d = a_d * self.set_units('pile_diameter')
 
-        return np.interp(x.magnitude, li, di) * self.set_units('pile_diameter')
+        return a_d
 
     # -- Method for cross sectional area at z --------------------------------
 
-    def xsection_area(self, z, soil_plug=False, box_area=False):
+    def xsection_area(self, z, soil_plug=False, box_area=False,
+                      with_units=True):
         """ Method that returns the pile cross sectional area at a depth,
         :math:`z`, from ground surface.
 
@@ -610,8 +673,9 @@ class Pile(Project):
         TODO: For concrete square hollow piles it currently returns solid area
 
         Args:
-            z (float): Vertical depth to the point of interest, measured from
-                the top of the soil profile.
+            z (float or array_like): Vertical depth to the point of interest,
+                measured from the top of the soil profile. An array of depths
+                returns an array of areas.
 
                 - For **SI**: Enter depth, *z*, in **meters**.
                 - For **English**: Enter depth, *z*, in **feet**.
@@ -622,76 +686,81 @@ class Pile(Project):
             box_area (bool): For H-piles, if set to ``TRUE``, the method
                 returns the box area.
 
+            with_units (bool): If false, the numerical value is returned in
+                the ``pile_xarea_alt`` units of the project unit system.
+
         Returns:
             Quantity: The cross sectional area of the pile w/ units.
 
         """
-        if z < 0:
+        if np.any(np.asarray(z) < 0):
             raise ValueError("Depth z cannot be negative here.")
         else:
             pass
 
-        # The length x from the top of the pile is defined as
-        x = self.length.magnitude - self.pen_depth.magnitude + z
-
-        if (x < 0) or (x > self.length.magnitude):
-            area = 0 * self.set_units('pile_xarea')
-        elif self.pile_type == 'concrete':
-            if self.shape in ['square-solid', 'square-hollow']:
-                area = self.area_of_shape(self._pile_a_d(z), 'square')
-            elif self.shape == 'hexagon':
-                area = self.area_of_shape(self._pile_a_d(z), 'hexagon')
-            elif self.shape == 'octagon':
-                area = self.area_of_shape(self._pile_a_d(z), 'octagon')
-            elif self.shape == 'circle-closed':
-                area = self.area_of_shape(self._pile_a_d(z), 'circle')
-            else:  # circle-open
-                if soil_plug:
-                    area = self.area_of_shape(self._pile_a_d(z), 'circle')
-                else:
-                    area = self.area_of_shape(self._pile_a_d(z), 'ring',
-                                              self.thickness)
+        # Had to convert area from in2 to ft2 because unit toe resistance units
+        # were not correctly formatted
+        area = self._xsection_area(z, soil_plug, box_area)
+        if np.ndim(area) == 0:
+            area = float(area)
+        if with_units:
+            area = area * self.set_units('pile_xarea_alt')
 
-        elif self.pile_type == 'pipe-open':
-            if soil_plug:
-                area = self.area_of_shape(self._pile_a_d(z), 'circle')
-            else:
-                area = self.area_of_shape(self._pile_a_d(z), 'ring',
-                                          self.thickness)
+        return area
 
-        elif self.pile_type == 'pipe-closed':
-            area = self.area_of_shape(self._pile_a_d(z), 'circle')
+    # -- Private method for cross sectional areas (unitless) -----------------
 
-        elif self.pile_type == 'h-pile':
-            if box_area:
-                area = english_hpiles[self.shape]['box_area'] \
-                       * self.set_units('pile_xarea')
-            else:
-                area = english_hpiles[self.shape]['area'] \
-                       * self.set_units('pile_xarea')
+    def _xsection_area(self, z, soil_plug=False, box_area=False):
+        """ A private method that follows the rules of
+        :meth:`~edafos.deepfoundations.piles.Pile.xsection_area` with plain
+        floats, for a depth or an array of depths.
 
-        else:  # Timber and cast-in-place piles
-            area = self.area_of_shape(self._pile_a_d(z), 'circle')
+        Args:
+            z (array_like): Vertical depths, measured from the top of the soil
+                profile (unitless).
+            soil_plug (bool): Same as in ``xsection_area``.
+            box_area (bool): Same as in ``xsection_area``.
 
-        # Had to convert area from in2 to ft2 because unit toe resistance units
-        # were not correctly formatted
-        return area.to(self.set_units('pile_xarea_alt'))
+        Returns:
+            array: Cross sectional areas in ``pile_xarea_alt`` units.
+        """
+        return self.geometry.xsection_area(self._x_of_z(z), soil_plug,
+                                           box_area)
+
+    # -- Private method for the length along the pile at z ------------------
+
+    def _x_of_z(self, z):
+        """ A private method that returns the length, :math:`x`, from the top
+        of the pile for depths :math:`z`, i.e. :math:`x = L_t - D_p + z`.
+
+        Args:
+            z (array_like): Vertical depths, measured from the top of the soil
+                profile (unitless).
+
+        Returns:
+            array: Lengths along the pile (unitless).
+        """
+        return (self.length.magnitude - self.pen_depth.magnitude +
+                np.asarray(z, dtype=float))
 
     # -- Method for side area between z1, z2 ---------------------------------
 
-    def side_area(self, z1, z2, box_area=False, inside=False):
+    def side_area(self, z1, z2, box_area=False, inside=False,
+                  with_units=True):
         """ Method that returns the side area for a section of the pile defined
         by z1 and z2.
 
         Args:
-            z1 (float): Vertical depth to the highest point of interest,
-                measured from the top of the soil profile.
+            z1 (float or array_like): Vertical depth to the highest point of
+                interest, measured from the top of the soil profile.
 
                 - For **SI**: Enter depth, *z1*, in **meters**.
                 - For **English**: Enter depth, *z1*, in **feet**.
 
-            z2 (float): Vertical depth to the lowest point of interest,
-                measured from the top of the soil profile.
+            z2 (float or array_like): Vertical depth to the lowest point of
+                interest, measured from the top of the soil profile. Arrays of
+                ``z1`` and ``z2`` return an array of side areas, one per
+                section.
 
                 - For **SI**: Enter depth, *z1*, in **meters**.
                 - For **English**: Enter depth, *z1*, in **feet**.
@@ -702,72 +771,131 @@ class Pile(Project):
             inside (bool): For open steel pipe piles only. If TRUE, it returns
                 the inside area of the pile for plugged calculations.
 
+            with_units (bool): If false, the numerical value is returned in
+                the ``pile_side_area`` units of the project unit system.
+
         Returns:
             Quantity: The side area of the pile w/ units between z1 and z2.
         """
-        if (z1 < 0) or (z2 < 0):
+        z1 = np.asarray(z1, dtype=float)
+        z2 = np.asarray(z2, dtype=float)
+        if np.any(z1 < 0) or np.any(z2 < 0):
             raise ValueError("Depth z cannot be negative here.")
-        elif z2 <= z1:
+        elif np.any(z2 <= z1):
             raise ValueError("z2 must be larger than z1")
         else:
             pass
 
-        # The length x from the top of the pile is defined as
-        x1 = self.length.magnitude - self.pen_depth.magnitude + z1
-        x2 = self.length.magnitude - self.pen_depth.magnitude + z2
-
-        h = (z2 - z1) * self.set_units('pile_length')
-
-        # TODO: Give these limits another thought, maybe not return zero.
-        if (x1 < 0) or (x1 > self.length.magnitude) or (x2 < 0) or \
-                (x2 > self.length.magnitude):
-            area = 0 * self.set_units('pile_xarea')
-        elif self.pile_type == 'concrete':
-            if self.shape in ['square-solid', 'square-hollow']:
-                area = 4 * self.area_of_shape(ad=self._pile_a_d(z1),
-                                              shape='trapezoid',
-                                              ad2=self._pile_a_d(z2), h=h)
-            elif self.shape == 'hexagon':
-                area = 6 * self.area_of_shape(ad=self._pile_a_d(z1),
-                                              shape='trapezoid',
-                                              ad2=self._pile_a_d(z2), h=h)
-            elif self.shape == 'octagon':
-                area = 8 * self.area_of_shape(ad=self._pile_a_d(z1),
-                                              shape='trapezoid',
-                                              ad2=self._pile_a_d(z2), h=h)
-            else:  # circle-closed and circle-open
-                area = self.area_of_shape(ad=self._pile_a_d(z1),
-                                          shape='cone',
-                                          ad2=self._pile_a_d(z2), h=h)
-
-        elif self.pile_type in ['pipe-open', 'pipe-closed']:
-            if (self.pile_type == 'pipe-open') and inside:
-                t = self.thickness.magnitude
-                area = self.area_of_shape(ad=(self._pile_a_d(z1) - 2*t *
-                                              self.set_units('pile_diameter')
-                                              ),
-                                          shape='cone',
-                                          ad2=(self._pile_a_d(z2) - 2*t *
-                                               self.set_units('pile_diameter')
-                                               ),
-                                          h=h)
-            else:
-                area = self.area_of_shape(ad=self._pile_a_d(z1), shape='cone',
-                                          ad2=self._pile_a_d(z2), h=h)
-        # TODO: adjust to accept si piles as well
-        elif self.pile_type == 'h-pile':
-            if box_area:
-                area = (english_hpiles[self.shape]['box_perimeter']
-                        * self.set_units('pile_diameter')) * h
-            else:
-                area = (english_hpiles[self.shape]['perimeter']
-                        * self.set_units('pile_diameter')) * h
+        area = self._side_area(z1, z2, box_area, inside)
+        if np.ndim(area) == 0:
+            area = float(area)
+        if with_units:
+            area = area * self.set_units('pile_side_area')
+
+        return area
+
+    # -- Private method for side areas (unitless) ----------------------------
+
+    def _side_area(self, z1, z2, box_area=False, inside=False):
+        """ A private method that follows the rules of
+        :meth:`~edafos.deepfoundations.piles.Pile.side_area` with plain
+        floats, for a segment or arrays of segments.
+
+        Args:
+            z1 (array_like): Depths to the top of the segments (unitless).
+            z2 (array_like): Depths to the bottom of the segments (unitless).
+            box_area (bool): Same as in ``side_area``.
+            inside (bool): Same as in ``side_area``.
+
+        Returns:
+            array: Side areas in ``pile_side_area`` units.
+        """
+        return self.geometry.side_area(self._x_of_z(z1), self._x_of_z(z2),
+                                       box_area, inside)
+
+    # -- Method for segment areas over arrays of depths --------------
+
+    def segment_areas(self, z, with_units=True):
+        """ Method that returns, in one vectorized pass, the side and toe
+        areas used by the capacity methods for all the segments defined by
+        consecutive depths in ``z``. It follows the same rules as
+        :meth:`~edafos.deepfoundations.piles.Pile.side_area` and
+        :meth:`~edafos.deepfoundations.piles.Pile.xsection_area`.
+
+        Args:
+            z (array_like): Sorted depths of the segment boundaries, measured
+                from the top of the soil profile.
+
+                - For **SI**: Enter depths in **meters**.
+                - For **English**: Enter depths in **feet**.
+
+            with_units (bool): If false, the numerical values are returned in
+                the units of the project unit system.
+
+        Returns:
+            dict: Arrays, one value per segment, keyed by:
+
+                - ``side_out``: Outside side area (box area for H-piles).
+                - ``side_out_net``: Outside side area (net area for
+                  H-piles).
+                - ``side_in``: Inside side area of open-ended pipe piles and
+                  net side area of H-piles, zero for all other piles.
+                - ``toe_plugged``: Plugged (box) toe area at the segment
+                  bottom.
+                - ``toe_unplugged``: Unplugged toe area at the segment bottom
+                  for open-ended pipe piles and H-piles, zero otherwise.
+
+            Side areas are in ``pile_side_area`` units, toe areas in
+            ``pile_xarea_alt`` units.
+        """
+        z = np.asarray(z, dtype=float)
+        areas = self._areas_between(z[:-1], z[1:])
+
+        if with_units:
+            for key in areas:
+                dim = 'pile_xarea_alt' if key.startswith('toe') \
+                    else 'pile_side_area'
+                areas[key] = areas[key] * self.set_units(dim)
+
+        return areas
+
+    # -- Private method for segment areas between pairs of depths -----------
+
+    def _areas_between(self, z1, z2, geometry=None):
+        """ A private method that returns the areas of
+        :meth:`~edafos.deepfoundations.piles.Pile.segment_areas` (unitless)
+        for segments that start at ``z1`` and end at ``z2``.
+
+        Args:
+            z1 (array_like): Depths to the top of the segments (unitless).
+            z2 (array_like): Depths to the bottom of the segments (unitless).
+            geometry (PileGeometry): Geometry to use instead of the pile's own,
+                e.g. a geometry extended below the pile toe.
 
-        else:  # Timber and cast-in-place piles
-            area = self.area_of_shape(ad=self._pile_a_d(z1), shape='cone',
-                                      ad2=self._pile_a_d(z2), h=h)
+        Returns:
+            dict: Arrays (unitless), one value per segment.
+        """
+        if geometry is None:
+            geometry = self.geometry
+        x1 = self._x_of_z(z1)
+        x2 = self._x_of_z(z2)
+
+        side_out = geometry.side_area(x1, x2, box_area=True)
+        side_out_net = (geometry.side_area(x1, x2)
+                        if self.pile_type == 'h-pile' else side_out)
+        toe_plugged = geometry.xsection_area(x2, soil_plug=True,
+                                             box_area=True)
+
+        if self.pile_type in ['pipe-open', 'h-pile']:
+            side_in = geometry.side_area(x1, x2, inside=True)
+            toe_unplugged = geometry.xsection_area(x2)
+        else:
+            side_in = np.zeros(len(x2))
+            toe_unplugged = np.zeros(len(x2))
 
-        return area.to(self.set_units('pile_side_area'))
+        return {'side_out': side_out, 'side_out_net': side_out_net,
+                'side_in': side_in, 'toe_plugged': toe_plugged,
+                'toe_unplugged': toe_unplugged}
 
     # -- Method that returns list of relevant z's ----------------------------
 
@@ -814,9 +942,14 @@ class Pile(Project):
 
     # -- Method that calculates AE/L -----------------------------------------
 
-    def aeol(self):
+    def aeol(self, with_units=True):
         """ Method that calculates :math:`AE/L`. For tapered piles it finds the
-        average area over the pile length.
+        average area over the pile length, integrating the piecewise-linear
+        taper exactly.
+
+        Args:
+            with_units (bool): If false, the numerical value is returned in
+                the units below.
 
         Returns:
             Quantity: :math:`AE/L`
@@ -826,19 +959,18 @@ class Pile(Project):
 
         """
 
-        if self.taper_dims is None:
-            area = self.xsection_area(self.pen_depth.magnitude)
-            aeol = area * self.modulus / self.length
-        else:
-            tmp_list = []
-            z_range = np.arange(self.pen_depth.magnitude-self.length.magnitude,
-                                self.pen_depth.magnitude, 0.1)
-            for i in z_range:
-                tmp_list.append(self.xsection_area(i).magnitude)
-            area = np.average(tmp_list) * self.xsection_area(z_range[0]).units
-            aeol = area * self.modulus / self.length
-
-        return aeol.to(self.set_units('aeol'))
+        # Exact average area, integrated over the taper sections
+        area = self.geometry.average_area()
+
+        # Factor that turns area times modulus over length into AE/L units
+        k = (1 * self.set_units('pile_xarea_alt') * self.modulus.units /
+             self.length.units).to(self.set_units('aeol')).magnitude
+        aeol = float(area) * self.modulus.magnitude / self.length.magnitude * k
+
+        if with_units:
+            aeol = aeol * self.set_units('aeol')
+
+        return aeol
 
     # -- Method for string representation ------------------------------------
 
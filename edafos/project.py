@@ -8,9 +8,72 @@ actions.
 # -- Imports -----------------------------------------------------------------
 from datetime import datetime
 from random import randint
-# import pint
-# units = pint.UnitRegistry()
-from edafos import units
+from edafos import set_units
+import edafos
+import hashlib
+import numpy as np
+
+
+# -- Lazy unit registry ------------------------------------------------------
+
+def __getattr__(name):
+    """ Module level attribute hook that keeps ``edafos.project.units``
+    available without creating the unit registry at import time.
+    """
+    if name == 'units':
+        return edafos.units
+    raise AttributeError("module 'edafos.project' has no attribute '{}'"
+                         "".format(name))
+
+
+# -- Content fingerprints ----------------------------------------------------
+
+def _canonical(part):
+    """ A private helper function that turns one part of the content of an
+    object into bytes that do not depend on the process, platform or on how
+    the value was entered: numbers become little-endian 64-bit floats, with a
+    single ``NaN`` and no negative zero, and every part is tagged with its
+    kind and size.
+
+    Args:
+        part: ``None``, a string, a number or an array of numbers or strings.
+
+    Returns:
+        bytes: The canonical form of ``part``.
+    """
+    if part is None:
+        return b'N'
+    elif isinstance(part, str):
+        data = part.encode('utf-8')
+        return b'S' + len(data).to_bytes(8, 'little') + data
+
+    values = np.asarray(part)
+    if values.dtype.kind in 'OUS':
+        return b'A' + b''.join(
+            _canonical(None if (i is None or i != i) else str(i))
+            for i in values.ravel())
+
+    values = np.asarray(values, dtype='<f8').ravel() + 0.
+    values[np.isnan(values)] = np.nan
+
+    return b'F' + len(values).to_bytes(8, 'little') + values.tobytes()
+
+
+def _digest(parts):
+    """ A private helper function that hashes the canonical form of a list
+    of parts with BLAKE2b.
+
+    Args:
+        parts (list): Parts accepted by ``_canonical``.
+
+    Returns:
+        str: A 32 character hexadecimal fingerprint.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(_canonical(part))
+
+    return digest.hexdigest()
 
 
 # -- Project Class -----------------------------------------------------------
@@ -57,13 +120,65 @@ class Project(object):
         self.sp = None
         self.pile = None
 
+    # -- Revision counter ----------------------------------------------------
+
+    def __setattr__(self, name, value):
+        """ Every assignment to a public attribute increments the private
+        ``_revision`` counter, so that cached results that depend on the
+        object can tell that it changed.
+        """
+        object.__setattr__(self, name, value)
+        if not name.startswith('_'):
+            object.__setattr__(self, '_revision',
+                               getattr(self, '_revision', 0) + 1)
+
+    # -- Content fingerprint -------------------------------------------------
+
+    def fingerprint(self):
+        """ Method that returns a fingerprint of the content of the object,
+        a hash of the canonical numerical state that the analyses depend on.
+        Unlike ``project_id``, objects with the same content have the same
+        fingerprint, in any process, which makes it a good cache key. For a
+        ``Project`` it combines the unit system and the fingerprints of the
+        attached soil profile and pile. The fingerprint is cached until the
+        object changes.
+
+        Returns:
+            str: A 32 character hexadecimal fingerprint.
+        """
+        key = self._fingerprint_key()
+        cached = getattr(self, '_fingerprint', None)
+        if (cached is None) or (cached[0] != key):
+            self._fingerprint = (key, _digest(self._fingerprint_parts()))
+
+        return self._fingerprint[1]
+
+    def _fingerprint_key(self):
+        """ Private method that identifies the state the fingerprint is
+        calculated for.
+        """
+        key = (self._revision,)
+        for obj in [self.sp, self.pile]:
+            key += (id(obj), getattr(obj, '_revision', 0))
+
+        return key
+
+    def _fingerprint_parts(self):
+        """ Private method that lists the content that the fingerprint is
+        calculated from, as accepted by ``_canonical``.
+        """
+        return ['Project', self.unit_system,
+                None if self.sp is None else self.sp.fingerprint(),
+                None if self.pile is None else self.pile.fingerprint()]
+
     # -- A Helper Method to set units ----------------------------------------
 
     def set_units(self, dim):
         """ A private helper method that returns the Pint units to be attached
         to a variable based on the set unit system and dimensionality (dim).
         Since this is a private method, the stored values will not be shown
-        in the docstring. Refer to the `unit_dict` in the code.
+        in the docstring. Refer to the precomputed unit table in
+        :func:`edafos.set_units`.
 
         Args:
             dim (str): The dimensionality for the variable. For example, layer
@@ -73,28 +188,7 @@ class Project(object):
             Pint units.
 
         """
-        unit_dict = {
-            'degrees': {'SI': units.degree, 'English': units.degree},
-            'length': {'SI': units.meter, 'English': units.feet},
-            'tuw': {'SI': units.kN / units.meter ** 3,
-                    'English': (units.kip/1000) / units.feet ** 3},
-            'stress': {'SI': units.kN / units.meter ** 2,
-                       'English': units.kip / units.feet ** 2},
-            'capacity': {'SI': units.kN, 'English': units.kip},
-            'pile_diameter': {'SI': units.cm, 'English': units.inches},
-            'pile_length': {'SI': units.meter, 'English': units.feet},
-            'pile_xarea': {'SI': units.cm ** 2, 'English': units.inches ** 2},
-            'pile_xarea_alt': {'SI': units.meter ** 2,
-                               'English': units.feet ** 2},
-            'pile_side_area': {'SI': units.meter ** 2,
-                               'English': units.feet ** 2},
-            'modulus': {'SI': 10e9 * units.pascal,
-                        'English': units.kip / units.inches ** 2},
-            'aeol': {'SI': units.kN / units.meter,
-                     'English': units.kip / units.inches},
-        }
-
-        return unit_dict[dim][self.unit_system]
+        return set_units(dim, self.unit_system)
 
     # -- Method to attach a soil profile -------------------------------------
     def attach_sp(self, obj):
@@ -154,7 +248,9 @@ class Project(object):
         if self.sp is None:
             pass
         else:
-            if self.sp.layers['Depth'].max() < self.pile.pen_depth.magnitude:
+            depths = self.sp._store.column('Depth')
+            if (len(depths) > 0) and \
+                    (depths[-1] < self.pile.pen_depth.magnitude):
                 raise ValueError("Pile penetration depth is larger than "
                                  "total soil profile depth.")
             else:
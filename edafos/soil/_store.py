@@ -0,0 +1,157 @@
+""" Provide the ``LayerStore`` class.
+
+"""
+
+# -- Imports -----------------------------------------------------------------
+import numpy as np
+import pandas as pd
+
+
+# -- LayerStore Class --------------------------------------------------------
+
+class LayerStore(object):
+    """ Class to represent the columnar, array-backed storage of the soil
+    layers of a :class:`~edafos.soil.profile.SoilProfile`.
+
+    Every column is kept in a preallocated NumPy array that grows
+    geometrically, so adding a layer is amortized :math:`O(1)` instead of
+    reallocating a whole data frame. It is not anticipated that users will
+    interact with this class.
+
+    """
+
+    # Careful when changing column names. Update SoilProfile.get_soil_prop
+    columns = ['Soil Type', 'Soil Desc', 'Depth', 'Height', 'TUW', 'Field N',
+               'Corr. N', 'Field Phi', 'Calc. Phi', 'Shear Su']
+    text_columns = ['Soil Type', 'Soil Desc']
+
+    # Keyword argument names of SoilProfile.add_layer and their columns
+    keys = {'soil_type': 'Soil Type', 'soil_desc': 'Soil Desc',
+            'height': 'Height', 'tuw': 'TUW', 'field_n': 'Field N',
+            'corr_n': 'Corr. N', 'field_phi': 'Field Phi',
+            'calc_phi': 'Calc. Phi', 'su': 'Shear Su'}
+
+    # -- Constructor ---------------------------------------------------------
+
+    def __init__(self, capacity=8):
+        """
+        Args:
+            capacity (int): Number of layers to preallocate room for.
+        """
+        self._size = 0
+        self._data = {}
+        for name in self.columns:
+            if name in self.text_columns:
+                self._data[name] = np.full(capacity, np.nan, dtype=object)
+            else:
+                self._data[name] = np.full(capacity, np.nan, dtype=float)
+
+    # -- Number of stored layers ---------------------------------------------
+
+    def __len__(self):
+        return self._size
+
+    # -- Private method that makes room for more layers ----------------------
+
+    def _reserve(self, n):
+        """ A private method that makes sure there is room for ``n`` more
+        layers, doubling the allocated arrays as needed.
+
+        Args:
+            n (int): Number of layers about to be added.
+        """
+        capacity = len(self._data['Depth'])
+        needed = self._size + n
+        if needed <= capacity:
+            return
+
+        while capacity < needed:
+            capacity = max(2 * capacity, 8)
+
+        for name, old in self._data.items():
+            new = np.full(capacity, np.nan, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            self._data[name] = new
+
+    # -- Method to append layers ---------------------------------------------
+
+    def append(self, **values):
+        """ Method that appends one layer. Missing values are stored as
+        ``NaN``.
+
+        Keyword Args:
+            Column names (as in ``LayerStore.columns``) and their values.
+        """
+        self.extend(**{k: [v] for k, v in values.items()})
+
+    def extend(self, **values):
+        """ Method that appends a batch of layers given column arrays of equal
+        length. Missing columns or ``None`` entries are stored as ``NaN``.
+
+        Keyword Args:
+            Column names (as in ``LayerStore.columns``) and their arrays.
+        """
+        lengths = set(len(v) for v in values.values())
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length.")
+        n = lengths.pop() if lengths else 0
+
+        self._reserve(n)
+        start, stop = self._size, self._size + n
+        for name, column in values.items():
+            if name in self.text_columns:
+                column = np.array([np.nan if i is None else i
+                                   for i in column], dtype=object)
+            else:
+                column = np.array([np.nan if i is None else i
+                                   for i in column], dtype=float)
+            self._data[name][start:stop] = column
+        self._size = stop
+
+        return self
+
+    # -- Methods to read and write values ------------------------------------
+
+    def column(self, name):
+        """ Method that returns a read-only view of a stored column.
+
+        Args:
+            name (str): Column name, as in ``LayerStore.columns``.
+
+        Returns:
+            numpy.ndarray: The column values for the stored layers.
+        """
+        view = self._data[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def set_value(self, name, i, value):
+        """ Method that overwrites a single stored value.
+
+        Args:
+            name (str): Column name, as in ``LayerStore.columns``.
+            i (int): Zero-based layer position.
+            value: The new value.
+        """
+        if not 0 <= i < self._size:
+            raise IndexError("Layer position {} is out of range.".format(i))
+        self._data[name][i] = np.nan if value is None else value
+
+        return self
+
+    # -- Method that builds a data frame -------------------------------------
+
+    def to_frame(self):
+        """ Method that builds a Pandas DataFrame from the stored columns.
+
+        Returns:
+            DataFrame: One row per layer, indexed from 1 with the index named
+            'Layer'.
+        """
+        df = pd.DataFrame(
+            {name: self._data[name][:self._size].copy()
+             for name in self.columns},
+            columns=self.columns,
+            index=pd.RangeIndex(1, self._size + 1, name='Layer'))
+
+        return df
@@ -4,7 +4,7 @@
 
 # -- Imports -----------------------------------------------------------------
 from edafos.project import Project
-from edafos.viz import ProfilePlot
+from ._store import LayerStore
 from tabulate import tabulate
 import numpy as np
 import pandas as pd
@@ -44,7 +44,10 @@ class SoilProfile(Project):
         super().__init__(unit_system=unit_system)
 
         # Set units for the water table
-        self.water_table = float(water_table) * self.set_units('length')
+        self._stresses = None
+        self._revision = 0
+        self._create_change_log()
+        self.water_table = water_table
 
         # A name for the soil profile object
         self.name = name
@@ -58,21 +61,147 @@ class SoilProfile(Project):
     # -- Soil Profile Instantiation Method (Private) -------------------------
 
     def _create_profile(self):
-        """ A private method that instantiates the soil profile data frame.
+        """ A private method that instantiates the soil profile layer store.
+        The layers are kept in a columnar
+        :class:`~edafos.soil._store.LayerStore` and the
+        :attr:`~edafos.soil.profile.SoilProfile.layers` data frame is only
+        built when it is read.
 
         Returns:
-            An empty Pandas DataFrame with two headers, one for the column
-            names and another for the column units.
-
+            self
         """
-        # Careful when changing column named. Update API.get_soil_prop
-        name_list = ['Soil Type', 'Soil Desc', 'Depth', 'Height', 'TUW',
-                     'Field N', 'Corr. N', 'Field Phi', 'Calc. Phi', 'Shear Su']
-        self.layers = pd.DataFrame(columns=name_list)
-        self.layers.index.name = 'Layer'
+        self._store = LayerStore()
+        self._layers = None
 
         return self
 
+    # -- Water table ---------------------------------------------------------
+
+    @property
+    def water_table(self):
+        """ Depth to water table measured from ground elevation (Quantity).
+        Setting a new value discards the cached stress table.
+        """
+        return self._water_table
+
+    @water_table.setter
+    def water_table(self, value):
+        if hasattr(value, 'magnitude'):
+            value = value.to(self.set_units('length')).magnitude
+        self._water_table = float(value) * self.set_units('length')
+        self._invalidate(columns={'Water Table'})
+
+    # -- Layers data frame (built lazily) ------------------------------------
+
+    @property
+    def layers(self):
+        """ The soil profile layers as a Pandas DataFrame, one row per layer
+        and indexed from 1. The data frame is built from the layer store on
+        first access and cached until the layers change. Every access returns
+        a copy.
+
+        .. note::
+
+           Writing to the data frame, e.g. ``sp.layers.loc[1, 'TUW'] = 110``,
+           no longer changes the soil profile, because the layers are kept in
+           a :class:`~edafos.soil._store.LayerStore`. Use
+           :meth:`~edafos.soil.profile.SoilProfile.add_layer` or
+           :meth:`~edafos.soil.profile.SoilProfile.update_layer` instead.
+           Assigning a new data frame raises ``AttributeError``.
+
+        Returns:
+            DataFrame: A copy of the soil profile layers.
+        """
+        if self._layers is None:
+            self._layers = self._store.to_frame()
+
+        return self._layers.copy()
+
+    @layers.setter
+    def layers(self, value):
+        raise AttributeError("Soil profile layers cannot be assigned. Use "
+                             "`add_layer` or `update_layer` to change them.")
+
+    # -- Content fingerprint (private parts) ---------------------------------
+
+    def _fingerprint_key(self):
+        return (self._revision,)
+
+    def _fingerprint_parts(self):
+        """ Private method that lists the content of the soil profile for
+        :meth:`~edafos.project.Project.fingerprint`: the unit system, the
+        water table and every layer column.
+        """
+        parts = ['SoilProfile', self.unit_system,
+                 self.water_table.magnitude]
+        for name in LayerStore.columns:
+            parts += [name, self._store.column(name)]
+
+        return parts
+
+    # -- Private method that discards derived data ---------------------------
+
+    def _invalidate(self, layer=None, columns=None):
+        """ A private method that discards data derived from the layer store,
+        i.e. the layers data frame and the stress table. It must be called
+        every time the stored layers or the water table change, and records
+        the change in the change log.
+
+        Args:
+            layer (int): Zero-based position of the only layer that changed,
+                or ``None`` if the change is not tied to one layer.
+            columns (set): Names of the changed columns of ``layer``, as in
+                ``LayerStore.columns``, or ``{'Water Table'}`` with no
+                ``layer``. If ``None``, the layers themselves changed (e.g. a
+                layer was added) and nothing derived from them can be reused.
+        """
+        self._layers = None
+        if (columns is None) or \
+                not columns.isdisjoint({'TUW', 'Water Table'}):
+            self._stresses = None
+        self._revision += 1
+
+        self._changes.append((self._revision, layer, columns))
+        if len(self._changes) > self._max_changes:
+            dropped = self._changes.pop(0)
+            self._changes_base = dropped[0]
+
+    # -- Private methods for the change log ----------------------------------
+
+    # Number of changes kept in the change log
+    _max_changes = 256
+
+    def _create_change_log(self):
+        """ A private method that starts an empty change log. Every change to
+        the layers or the water table is logged with the revision it produced,
+        so that analyses can work out what they need to recalculate.
+        """
+        self._changes = []
+        self._changes_base = self._revision
+
+    def _changes_since(self, revision):
+        """ A private method that returns the layer changes made after a given
+        revision of the soil profile.
+
+        Args:
+            revision (int): A past value of ``_revision``.
+
+        Returns:
+            list: ``(layer, columns)`` tuples, oldest first, where ``layer`` is
+            ``None`` for a water table change, or ``None`` if the layers
+            themselves changed or the change log does not go back as far as
+            ``revision``.
+        """
+        if revision < self._changes_base:
+            return None
+
+        changes = [(layer, columns) for rev, layer, columns in self._changes
+                   if rev > revision]
+        if any(columns is None for _, columns in changes):
+            return None
+
+        return changes
+
     # -- Method to add layers ------------------------------------------------
 
     def add_layer(self, soil_type, height, **kwargs):
@@ -171,27 +300,220 @@ class SoilProfile(Project):
                 pass
 
         # Calculate depth from layers heights
-        if len(self.layers) == 0:
+        if len(self._store) == 0:
             depth = height
         else:
-            depth = self.layers.loc[len(self.layers), 'Depth'] + height
+            depth = self._store.column('Depth')[-1] + height
+
+        # Store values
+        self._store.append(**{
+            'Soil Type': soil_type, 'Soil Desc': soil_desc, 'Depth': depth,
+            'Height': height, 'TUW': tuw, 'Field N': field_n,
+            'Corr. N': corr_n, 'Field Phi': field_phi, 'Calc. Phi': calc_phi,
+            'Shear Su': su})
+        self._invalidate()
+
+        return self
+
+    # -- Method to add layers in bulk ----------------------------------------
+
+    def add_layers(self, data=None, **kwargs):
+        """ Method to add many layers to the soil profile at once. The whole
+        batch is validated with vectorized checks and the layer depths are
+        computed with a single cumulative sum, which is much faster than
+        calling :meth:`~edafos.soil.profile.SoilProfile.add_layer` for every
+        layer. Either ``data`` or the keyword arguments must be given.
+
+        Args:
+            data (DataFrame or list): A Pandas DataFrame with one row per
+                layer or a list of dictionaries, one per layer. Columns (or
+                keys) are the keyword arguments of
+                :meth:`~edafos.soil.profile.SoilProfile.add_layer`. The column
+                names of :attr:`~edafos.soil.profile.SoilProfile.layers` are
+                also accepted, in which case the ``Depth`` column is ignored
+                and recalculated from the heights.
+
+        Keyword Args:
+            soil_type, soil_desc, height, tuw, field_n, corr_n, field_phi,
+            calc_phi, su (list): Column arrays of equal length, same units and
+                permissible values as in
+                :meth:`~edafos.soil.profile.SoilProfile.add_layer`.
+                ``soil_type`` and ``height`` are required.
+
+        Returns:
+            self
+        """
+        # Gather the input as columns
+        if (data is not None) and kwargs:
+            raise ValueError("Enter either 'data' or column arrays, not both.")
+        elif isinstance(data, pd.DataFrame):
+            columns = {k: data[k].tolist() for k in data.columns}
+        elif data is not None:
+            columns = {}
+            for i, row in enumerate(data):
+                for key in row:
+                    columns.setdefault(key, [None] * len(data))
+                    columns[key][i] = row[key]
+        else:
+            columns = kwargs
+
+        # Accept the column names of the layers data frame too
+        names = {v: k for k, v in LayerStore.keys.items()}
+        columns = {names.get(k, k): v for k, v in columns.items()
+                   if k != 'Depth'}
+
+        # Check for valid attributes
+        allowed_keys = list(LayerStore.keys)
+        for key in columns:
+            if key not in allowed_keys:
+                raise AttributeError("'{}' is not a valid attribute. The "
+                                     "allowed attributes are: {}"
+                                     "".format(key, allowed_keys))
+        for key in ['soil_type', 'height']:
+            if key not in columns:
+                raise ValueError("Missing required column '{}'.".format(key))
+
+        lengths = set(len(v) for v in columns.values())
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length.")
+        elif lengths == {0}:
+            return self
+
+        # Check for soil type
+        soil_type = np.array(columns['soil_type'], dtype=object)
+        bad = ~np.isin(soil_type, ['cohesive', 'cohesionless'])
+        if bad.any():
+            raise ValueError("Soil type can only be 'cohesive' or "
+                             "'cohesionless'. Check layer(s) {}."
+                             "".format((np.flatnonzero(bad) + 1).tolist()))
+
+        # Check for soil description
+        allowed_soil_desc = ['gravel', 'sand-gravel', 'sand', 'sand-silt',
+                             'silt']
+        if 'soil_desc' in columns:
+            soil_desc = np.array(columns['soil_desc'], dtype=object)
+            given = ~pd.isnull(soil_desc)
+            bad = given & ~np.isin(soil_desc, allowed_soil_desc)
+            if bad.any():
+                raise ValueError("'{}' is not a valid soil description input."
+                                 "\nValid inputs are: {}."
+                                 "".format(soil_desc[bad][0],
+                                           allowed_soil_desc))
+
+        # Check that all inputs are positive numbers
+        numeric = {}
+        for key in allowed_keys[2:]:
+            if key not in columns:
+                continue
+            values = [np.nan if i is None else i for i in columns[key]]
+            try:
+                # Booleans are rejected, as in add_layer
+                if (np.array(values).dtype.kind not in 'iuf') or \
+                        any(isinstance(i, (bool, np.bool_)) for i in values):
+                    raise TypeError
+                numeric[key] = np.array(values, dtype=float)
+            except (TypeError, ValueError):
+                raise TypeError("Column '{}' contains non-numerical values. "
+                                "\nEnter only positive numbers (int or float) "
+                                "for soil properties.".format(key))
+            if np.any(numeric[key] < 0):
+                raise ValueError("Value '{}' is not permissible. Enter "
+                                 "positive numbers only for soil properties."
+                                 "".format(numeric[key].min()))
+        if np.isnan(numeric['height']).any():
+            raise ValueError("All layers must have a height.")
+
+        # Calculate depths from layers heights
+        if len(self._store) == 0:
+            top = 0
+        else:
+            top = self._store.column('Depth')[-1]
+        depth = top + np.cumsum(numeric['height'])
+
+        # Store values
+        batch = {LayerStore.keys[k]: v for k, v in numeric.items()}
+        batch['Soil Type'] = soil_type
+        if 'soil_desc' in columns:
+            batch['Soil Desc'] = columns['soil_desc']
+        batch['Depth'] = depth
+        self._store.extend(**batch)
+        self._invalidate()
+
+        return self
+
+    # -- Method to update a layer -------------------------------------------
+
+    def update_layer(self, layer, **kwargs):
+        """ Method that changes the properties of an existing layer, e.g. to
+        try out a different :math:`s_u` for a clay layer. Unlike adding
+        layers, the change is logged per layer, so that analyses built on the
+        profile only recalculate the segments it affects (see
+        :meth:`~edafos.deepfoundations.analysis.AnalysisContext.refresh`).
+
+        Args:
+            layer (int): The layer number, as in the index of
+                :attr:`~edafos.soil.profile.SoilProfile.layers` (starting
+                from 1).
+
+        Keyword Args:
+            The keyword arguments of
+            :meth:`~edafos.soil.profile.SoilProfile.add_layer`, except
+            ``height``. Use ``None`` to clear a value.
+
+        Returns:
+            self
+        """
+        # Check for valid layer
+        if (type(layer) is not int) or not (1 <= layer <= len(self._store)):
+            raise ValueError("Layer '{}' does not exist. The soil profile has "
+                             "{} layer(s).".format(layer, len(self._store)))
+
+        # Check for valid attributes
+        allowed_keys = ['soil_type', 'soil_desc', 'tuw', 'field_n',
+                        'corr_n', 'field_phi', 'calc_phi', 'su']
+        for key in kwargs:
+            if key not in allowed_keys:
+                raise AttributeError("'{}' is not a valid attribute. The "
+                                     "allowed attributes are: {}"
+                                     "".format(key, allowed_keys))
 
-        # Store values in data frame
-        self.layers.loc[len(self.layers)+1] = [
-            soil_type, soil_desc, depth, height, tuw, field_n, corr_n,
-            field_phi, calc_phi, su]
+        # Check for soil type
+        if ('soil_type' in kwargs) and \
+                (kwargs['soil_type'] not in ['cohesive', 'cohesionless']):
+            raise ValueError("Soil type can only be 'cohesive' or "
+                             "'cohesionless'.")
+        # Check for soil description
+        allowed_soil_desc = ['gravel', 'sand-gravel', 'sand', 'sand-silt',
+                             'silt']
+        soil_desc = kwargs.get('soil_desc', None)
+        if (soil_desc is not None) and (soil_desc not in allowed_soil_desc):
+            raise ValueError("'{}' is not a valid soil description input.\n"
+                             "Valid inputs are: {}."
+                             "".format(soil_desc, allowed_soil_desc))
 
-        # Reset index to start at 1
-        if self.layers.index[0] == 0:
-            self.layers.index = self.layers.index + 1
+        # Check that all inputs are positive numbers
+        for key in allowed_keys[2:]:
+            i = kwargs.get(key, None)
+            if (i is not None) and (type(i) not in [int, float]):
+                raise TypeError("Value '{}' is of type {} and is not "
+                                "permissible. \nEnter only positive numbers "
+                                "(int or float) for soil properties."
+                                "".format(i, type(i)))
+            elif (i is not None) and (i < 0):
+                raise ValueError("Value '{}' is not permissible. Enter "
+                                 "positive numbers only for soil properties."
+                                 "".format(i))
+            else:
+                pass
 
-        # Enforce proper data types
-        # TODO: Repeated every time a layer is added. Is there a better way?
-        self.layers.fillna(np.nan, inplace=True)
-        # for column in self.layers.columns.levels[0]:
-        for column in self.layers.columns:
-            if column not in ['Soil Type', 'Soil Desc']:
-                self.layers[column] = self.layers[column].astype(float)
+        # Store values
+        columns = set()
+        for key, value in kwargs.items():
+            name = LayerStore.keys[key]
+            self._store.set_value(name, layer - 1, value)
+            columns.add(name)
+        if columns:
+            self._invalidate(layer=layer - 1, columns=columns)
 
         return self
 
@@ -247,8 +569,8 @@ class SoilProfile(Project):
         else:
             pass
 
-        bot_list = self.layers['Depth'].values
-        mid_list = bot_list - self.layers['Height'].values / 2
+        bot_list = self._store.column('Depth')
+        mid_list = bot_list - self._store.column('Height') / 2
 
         if loc == 'bot':
             z_list = [0] + bot_list.tolist()
@@ -262,14 +584,16 @@ class SoilProfile(Project):
 
     # -- Method to calculate stresses ----------------------------------------
 
-    def calculate_stress(self, z, kind='effective'):
+    def calculate_stress(self, z, kind='effective', with_units=True):
         """ Method to calculate stresses (pore water, total, effective). It
         defaults to 'effective'. Change the ``kind`` parameter to get the
         other stresses.
 
         Args:
-            z (float): Vertical depth to the point of interest, measured from
-                the top of the soil profile.
+            z (float or array_like): Vertical depth to the point of interest,
+                measured from the top of the soil profile. A list or array of
+                depths is evaluated in a single vectorized pass and the
+                stresses are returned as arrays of the same shape.
 
                 - For **SI**: Enter depth, *z*, in **meters**.
                 - For **English**: Enter depth, *z*, in **feet**.
@@ -279,6 +603,11 @@ class SoilProfile(Project):
                 and ``all``. The last value, ``all``, returns all three
                 stresses in the same order.
 
+            with_units (bool): If true, returns stresses with units attached
+                (aka as a 'Quantity'). If false, only numerical results are
+                returned as per the units below, which skips all unit
+                handling for fast internal calculations.
+
         Returns:
             Quantity: A physical quantity with associated units.
 
@@ -295,95 +624,137 @@ class SoilProfile(Project):
             raise ValueError("'{}' entry is invalid. Choose from {}."
                              "".format(kind, allowed))
 
-        # Check that z is within limits
-        max_depth = self.layers['Height'].sum()
-        if z > max_depth:
-            raise ValueError("Depth z = {0} {2}, is beyond the total defined "
-                             "soil profile depth, {1} {2}."
-                             "".format(z, max_depth, self.set_units('length')))
-        elif ((z < 0) and (self.water_table.magnitude >= 0)) \
-                or (z < self.water_table.magnitude < 0):
-            raise ValueError("Nothing but thin air at z = {} {}. Try lower."
-                             "".format(z, self.set_units('length')))
-        else:
-            pass
+        total_stress, pore_water, effective_stress = \
+            self._calculate_stress_array(z)
 
-        # Set units for input parameter, z
-        z = float(z) * self.set_units('length')
+        # Scalar depths get scalar stresses back
+        if np.ndim(z) == 0:
+            total_stress = float(total_stress)
+            pore_water = float(pore_water)
+            effective_stress = float(effective_stress)
 
-        # Define zw, the vertical distance below the water table.
-        zw = z - self.water_table
-        if zw.magnitude < 0:
-            zw = 0 * zw.units
+        if with_units:
+            total_stress = total_stress * self.set_units('stress')
+            pore_water = pore_water * self.set_units('stress')
+            effective_stress = effective_stress * self.set_units('stress')
 
-        # Define pore water pressure
-        if self.unit_system == 'SI':
-            gamma_w = 9.81 * self.set_units('tuw')
+        if kind == 'effective':
+            return effective_stress
+        elif kind == 'total':
+            return total_stress
+        elif kind == 'pore_water':
+            return pore_water
         else:
-            gamma_w = 62.4 * self.set_units('tuw')
-        pore_water = zw * gamma_w
+            return total_stress, pore_water, effective_stress
 
-        # -- Define total stress ---------------------------------------------
-        h1 = self.layers['Height'][1] * self.set_units('length')
-        g1 = self.layers['TUW'][1] * self.set_units('tuw')
+    # -- Private method that builds the stress table -------------------------
 
-        # Prepare for Takeaway No 4
-        if (z.magnitude >= 0) and (self.water_table.magnitude < 0):
-            stress_from_water_body = abs(self.water_table) * gamma_w
-        else:
-            stress_from_water_body = 0 * self.set_units('stress')
+    def _stress_table(self):
+        """ A private method that returns the per-layer stress table. The
+        table holds the top and bottom depth of every layer with the total,
+        pore water and effective stresses at these points, so that any stress
+        query needs a sorted search over the layer bottoms and one
+        multiplication. It is built on first use and cached until the layers
+        or the water table change.
 
-        # Main if statement
-        if (z.magnitude < 0) and (self.water_table.magnitude < 0):
-            total_stress = pore_water
-        elif z < h1:
-            total_stress = z * g1 + stress_from_water_body
+        Returns:
+            dict: Arrays (unitless) keyed by ``top``, ``bottom``, ``tuw``,
+            ``total_top``, ``total_bot``, ``pore_top``, ``pore_bot``,
+            ``effective_top`` and ``effective_bot``, plus the unit weight of
+            water, ``gamma_w``, and the stress from a water body above ground,
+            ``water_body``. Unit weights are in the units of
+            ``set_units('stress')`` per unit length.
+        """
+        if self._stresses is not None:
+            return self._stresses
 
-        elif z.magnitude in self.layers['Depth'].values:
+        wt = self.water_table.magnitude
 
-            # Get the layer index where z is at the interface
-            ix = self.layers[self.layers['Depth'] == z.magnitude].index[0]
+        # Factor that turns length times unit weight into stress
+        k = (1 * self.set_units('length') * self.set_units('tuw')).to(
+            self.set_units('stress')).magnitude
+        gamma_w = 9.81 * k if self.unit_system == 'SI' else 62.4 * k
 
-            total_stress = sum((self.layers['Height'][0:ix].values
-                                * self.set_units('length')) *
-                               (self.layers['TUW'][0:ix].values *
-                                self.set_units('tuw'))
-                               ) + stress_from_water_body
+        heights = self._store.column('Height')
+        depths = self._store.column('Depth')
+        tuw = self._store.column('TUW') * k
 
-        else:
-            # Get the previous layer index where z is in
-            ixp = self.layers[self.layers['Depth'] < z.magnitude].index[-1]
+        # Stress from a water body above ground (offshore)
+        water_body = abs(wt) * gamma_w if wt < 0 else 0.
 
-            # Get the current layer index where z is in
-            ixc = self.layers[self.layers['Depth'] > z.magnitude].index[0]
+        # Total stress at the top of each layer from the cumulative weights
+        weight = np.cumsum(heights * tuw)
+        total_top = np.concatenate(([0.], weight[:-1])) + water_body
+        total_bot = weight + water_body
 
-            total_stress = (sum((self.layers['Height'][0:ixp].values *
-                                 self.set_units('length')) *
-                                (self.layers['TUW'][0:ixp].values *
-                                 self.set_units('tuw'))
-                                ) + (
-                                ((z.magnitude - self.layers['Depth'][ixp]) *
-                                 self.set_units('length')) *
-                                (self.layers['TUW'][ixc] *
-                                 self.set_units('tuw')))
+        top = depths - heights
+        pore_top = np.clip(top - wt, 0, None) * gamma_w
+        pore_bot = np.clip(depths - wt, 0, None) * gamma_w
 
-                            ) + stress_from_water_body
+        self._stresses = {
+            'top': top, 'bottom': depths, 'tuw': tuw,
+            'total_top': total_top, 'total_bot': total_bot,
+            'pore_top': pore_top, 'pore_bot': pore_bot,
+            'effective_top': total_top - pore_top,
+            'effective_bot': total_bot - pore_bot,
+            'gamma_w': gamma_w, 'water_body': water_body,
+        }
 
-        # Define effective stress
-        effective_stress = total_stress - pore_water
+        return self._stresses
 
-        if kind == 'effective':
-            return effective_stress
-        elif kind == 'total':
-            return total_stress
-        elif kind == 'pore_water':
-            return pore_water
+    # -- Private method to calculate stresses over arrays of depths ----------
+
+    def _calculate_stress_array(self, z):
+        """ A private method that calculates the total, pore water and
+        effective stresses for an array of depths in one vectorized pass.
+
+        Each depth is located in its layer with a sorted search over the layer
+        bottoms of the cached stress table and the total stress is obtained
+        from the stress at the top of that layer. A depth that falls exactly
+        on an interface is assigned to the layer above it.
+
+        Args:
+            z (array_like): Vertical depths, measured from the top of the soil
+                profile (unitless).
+
+        Returns:
+            tuple: Three arrays (unitless) for the total, pore water and
+            effective stresses, in the units of ``set_units('stress')``.
+        """
+        z = np.asarray(z, dtype=float)
+        wt = self.water_table.magnitude
+        table = self._stress_table()
+
+        # Check that z is within limits
+        if len(table['bottom']) == 0:
+            raise ValueError("No layers in soil profile.")
+        max_depth = table['bottom'][-1]
+        if np.any(z > max_depth):
+            raise ValueError("Depth z = {0} {2}, is beyond the total defined "
+                             "soil profile depth, {1} {2}."
+                             "".format(z.max(), max_depth,
+                                       self.set_units('length')))
+        elif ((wt >= 0) and np.any(z < 0)) or ((wt < 0) and np.any(z < wt)):
+            raise ValueError("Nothing but thin air at z = {} {}. Try lower."
+                             "".format(z.min(), self.set_units('length')))
         else:
-            return total_stress, pore_water, effective_stress
+            pass
+
+        # Layer that contains each z, interfaces belong to the layer above
+        ix = np.searchsorted(table['bottom'], z, side='left')
+        ix = np.clip(ix, 0, len(table['bottom']) - 1)
+
+        pore_water = np.clip(z - wt, 0, None) * table['gamma_w']
+        total_stress = np.where(
+            z < 0,
+            pore_water,
+            table['total_top'][ix] + (z - table['top'][ix]) * table['tuw'][ix])
+
+        return total_stress, pore_water, total_stress - pore_water
 
     # -- Method that returns soil properties given z -------------------------
 
-    def get_soil_prop(self, z, sp):
+    def get_soil_prop(self, z, sp, with_units=True):
         """ This method will return the soil property (with units), i.e. SPT-N,
         total unit weight, undrained shear strength, etc. at depth, :math:`z`.
         The soil properties must have been previously defined with the
@@ -402,48 +773,76 @@ class SoilProfile(Project):
             sp (str): Available inputs exactly as defined in the keyword
                 arguments of :meth:`~edafos.soil.profile.SoilProfile.add_layer`.
 
+            with_units (bool): If false, the numerical value is returned
+                without units, in the units of the project unit system.
+
         Returns:
             Quantity: Soil property with units.
         """
-        # Shorthand for convenience
-        df = self.layers
+        if np.ndim(z) > 0:
+            raise ValueError("Use `get_soil_props` for arrays of depths.")
+
+        return self.get_soil_props([z], sp, with_units)[0]
+
+    # -- Method that returns many soil properties at many z's ----------------
+
+    def get_soil_props(self, z, props, with_units=True):
+        """ Batched version of
+        :meth:`~edafos.soil.profile.SoilProfile.get_soil_prop`. It returns
+        one or more soil properties at an array of depths, :math:`z`, with a
+        single sorted search over the layer bottoms. A depth that falls
+        exactly on a layer interface gets the properties of the layer above.
+
+        Args:
+            z (array_like): Vertical depths to the points of interest,
+                measured from the top of the soil profile.
+
+                - For **SI**: Enter depth, *z*, in **meters**.
+                - For **English**: Enter depth, *z*, in **feet**.
+
+            props (str or list): One, or a list of, the inputs exactly as
+                defined in the keyword arguments of
+                :meth:`~edafos.soil.profile.SoilProfile.add_layer`.
+
+            with_units (bool): If false, numerical arrays are returned
+                without units, in the units of the project unit system.
+
+        Returns:
+            Quantity or array: For a single property, an array aligned with
+            ``z`` (with units where applicable). For a list of properties, a
+            list of such arrays in the requested order.
+        """
+        z = np.asarray(z, dtype=float)
+        depths = self._store.column('Depth')
 
         # z check
-        if z < 0:
+        if np.any(z < 0):
             raise ValueError("z cannot be negative.")
-        elif z > df['Depth'].max():
+        elif (len(depths) == 0) or np.any(z > depths[-1]):
             raise ValueError("z cannot be larger than max soil profile depth.")
 
         # Input check
         allowed = ['soil_type', 'soil_desc', 'height', 'tuw', 'field_n',
                    'corr_n', 'field_phi', 'calc_phi', 'su']
-        if sp not in allowed:
-            raise ValueError("'{}' is not a valid input. Allowed inputs are {}"
-                             ".".format(sp, allowed))
-
-        cond = df[df['Depth'] < z].index.max()
-        index = 1 if cond is np.nan else cond + 1
-
-        if sp == 'soil_type':
-            value = df['Soil Type'][index]
-        elif sp == 'soil_desc':
-            value = df['Soil Desc'][index]
-        elif sp == 'height':
-            value = df['Height'][index] * self.set_units('length')
-        elif sp == 'tuw':
-            value = df['TUW'][index] * self.set_units('tuw')
-        elif sp == 'field_n':
-            value = df['Field N'][index]
-        elif sp == 'corr_n':
-            value = df['Corr. N'][index]
-        elif sp == 'field_phi':
-            value = df['Field Phi'][index] * self.set_units('degrees')
-        elif sp == 'calc_phi':
-            value = df['Calc. Phi'][index] * self.set_units('degrees')
-        else:  # su
-            value = df['Shear Su'][index] * self.set_units('stress')
-
-        return value
+        req = [props] if isinstance(props, str) else list(props)
+        for sp in req:
+            if sp not in allowed:
+                raise ValueError("'{}' is not a valid input. Allowed inputs "
+                                 "are {}.".format(sp, allowed))
+
+        # Layer that contains each z
+        ix = np.searchsorted(depths, z, side='left')
+
+        dims = {'height': 'length', 'tuw': 'tuw', 'field_phi': 'degrees',
+                'calc_phi': 'degrees', 'su': 'stress'}
+        values = []
+        for sp in req:
+            value = self._store.column(LayerStore.keys[sp])[ix]
+            if with_units and (sp in dims):
+                value = value * self.set_units(dims[sp])
+            values.append(value)
+
+        return values[0] if isinstance(props, str) else values
 
     # -- Method that corrects field SPT-N values -----------------------------
 
@@ -454,22 +853,17 @@ class SoilProfile(Project):
         Returns:
 
         """
-        mid_z = []
-        for i in self.layers.index:
-            if i == 1:
-                mid_z.append(self.layers['Height'][i] / 2)
-            else:
-                mid_z.append(self.layers['Depth'][i - 1] +
-                             self.layers['Height'][i] / 2)
+        mid_z = self.z_of_layers(loc='mid')[1:]
 
-        for i, z in zip(self.layers.index, mid_z):
-            field_n = self.layers['Field N'][i]
-            corr_n = self.layers['Corr. N'][i]
+        for i, z in enumerate(mid_z):
+            field_n = self._store.column('Field N')[i]
+            corr_n = self._store.column('Corr. N')[i]
             if not np.isnan(field_n) and np.isnan(corr_n):
-                sigma = self.calculate_stress(z).magnitude
+                sigma = self.calculate_stress(z, with_units=False)
                 print(sigma)
                 c_n = min(0.77 * np.log(40 / sigma), 2.0)
-                self.layers['Corr. N'][i] = int(c_n * field_n)
+                self._store.set_value('Corr. N', i, int(c_n * field_n))
+                self._invalidate(layer=i, columns={'Corr. N'})
 
         return self
 
@@ -481,13 +875,17 @@ class SoilProfile(Project):
         Returns:
 
         """
+        # The plotting stack is only imported when a plot is requested
+        from edafos.viz import ProfilePlot
+
         return ProfilePlot(self).construct()
 
     # -- Method for string representation ------------------------------------
 
     def __str__(self):
 
-        layer_tbl = tabulate(self.layers, headers='keys', tablefmt='simple')
+        layer_tbl = tabulate(self._store.to_frame(), headers='keys',
+                             tablefmt='simple')
 
         unit_list = [
             ['Depth', '(m)' if self.unit_system == 'SI' else '(ft)'],
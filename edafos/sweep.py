@@ -0,0 +1,206 @@
+""" Provide the parametric sweep runner.
+
+Capacity analyses for every combination of soil profiles, piles and capacity
+methods are fanned out over a pool of processes. Profiles and piles are
+shipped to every worker once, in compact form, and only small integer tasks
+travel afterwards.
+
+"""
+
+# -- Imports -----------------------------------------------------------------
+from concurrent.futures import ProcessPoolExecutor
+from edafos.project import Project
+from edafos.soil import SoilProfile
+from edafos.soil._store import LayerStore
+from edafos.deepfoundations import Pile, Olson90
+import copy
+import itertools
+import pandas as pd
+
+
+# -- Worker state ------------------------------------------------------------
+
+# Compact profiles and piles, and the objects rebuilt from them, per process
+_state = {'profiles': [], 'piles': [], 'methods': [], 'built': {}}
+
+
+# -- Compact forms -----------------------------------------------------------
+
+def _pack_profile(sp):
+    """ A private function that returns the compact, picklable form of a
+    soil profile: its unit system, water table and layer columns.
+
+    Args:
+        sp (class): A ``SoilProfile`` object.
+
+    Returns:
+        dict: The compact profile.
+    """
+    return {'unit_system': sp.unit_system,
+            'water_table': sp.water_table.magnitude,
+            'columns': {key: sp._store.column(name).copy()
+                        for key, name in LayerStore.keys.items()}}
+
+
+def _unpack_profile(data):
+    """ A private function that rebuilds a soil profile from its compact
+    form, as returned by ``_pack_profile``.
+    """
+    sp = SoilProfile(unit_system=data['unit_system'],
+                     water_table=data['water_table'])
+    sp.add_layers(**data['columns'])
+
+    return sp
+
+
+def _pack_pile(pile):
+    """ A private function that returns the compact, picklable form of a
+    pile: its unit system and the keyword arguments that construct it as it
+    is now, including properties assigned after it was created.
+
+    Args:
+        pile (class): A ``Pile`` object.
+
+    Returns:
+        dict: The compact pile.
+    """
+    data = {'unit_system': pile.unit_system, 'kwargs': pile._current_kwargs()}
+
+    # Make sure the workers analyse the same pile
+    try:
+        same = _unpack_pile(data).fingerprint() == pile.fingerprint()
+    except ValueError:
+        same = False
+    if not same:
+        raise ValueError("The pile cannot be rebuilt from its current "
+                         "properties. Create a new `Pile` instead of "
+                         "changing its type, shape or taper.")
+
+    return data
+
+
+def _unpack_pile(data):
+    """ A private function that rebuilds a pile from its compact form, as
+    returned by ``_pack_pile``.
+    """
+    # A copy, the pile converts its taper dimensions in place
+    return Pile(unit_system=data['unit_system'],
+                **copy.deepcopy(data['kwargs']))
+
+
+# -- Worker functions --------------------------------------------------------
+
+def _init_worker(profiles, piles, methods):
+    """ A private function that receives the compact profiles and piles,
+    once per worker process.
+    """
+    _state['profiles'] = profiles
+    _state['piles'] = piles
+    _state['methods'] = methods
+    _state['built'] = {}
+
+
+def _built(kind, i):
+    """ A private function that rebuilds a profile or pile once per worker
+    process and reuses it afterwards.
+    """
+    key = (kind, i)
+    if key not in _state['built']:
+        if kind == 'profiles':
+            _state['built'][key] = _unpack_profile(_state['profiles'][i])
+        else:
+            _state['built'][key] = _unpack_pile(_state['piles'][i])
+
+    return _state['built'][key]
+
+
+def _run_task(task):
+    """ A private function that runs one capacity analysis.
+
+    Args:
+        task (tuple): Positions of the profile, pile and method.
+
+    Returns:
+        tuple: The method name, capacity, plugged flag and error message
+        (``None`` if the analysis succeeded).
+    """
+    i, j, k = task
+    method = _state['methods'][k]
+    try:
+        project = Project(unit_system=_state['profiles'][i]['unit_system'])
+        project.attach_sp(_built('profiles', i))
+        project.attach_pile(_built('piles', j))
+        analysis = method(project)
+    except (ValueError, TypeError, AttributeError) as error:
+        return method.__name__, None, None, str(error)
+
+    return analysis.method_name, analysis.capacity, analysis.plugged, None
+
+
+# -- Sweep -------------------------------------------------------------------
+
+def run(profiles, piles, methods=None, workers=None, chunksize=None):
+    """ Function that runs capacity analyses for every combination of soil
+    profiles, piles and capacity methods.
+
+    Args:
+        profiles (list or dict): ``SoilProfile`` objects. If a dict, the keys
+            are used as labels in the results, otherwise the positions.
+        piles (list or dict): ``Pile`` objects, labelled as ``profiles``.
+        methods (list): Capacity method classes, e.g.
+            :class:`~edafos.deepfoundations.capacity_api.Olson90`. Defaults to
+            ``[Olson90]``.
+        workers (int): Number of worker processes. If ``None`` or 1, the
+            analyses run in the current process.
+        chunksize (int): Number of analyses sent to a worker at a time.
+            Defaults to about four chunks per worker.
+
+    Returns:
+        DataFrame: One row per analysis, with the columns ``Profile``,
+        ``Pile``, ``Method``, ``Capacity`` (in the ``capacity`` units of the
+        unit system), ``Plugged`` and ``Error``. Analyses that fail keep
+        the error message and no capacity.
+    """
+    if isinstance(profiles, dict):
+        profile_keys, profiles = list(profiles), list(profiles.values())
+    else:
+        profile_keys, profiles = list(range(len(profiles))), list(profiles)
+    if isinstance(piles, dict):
+        pile_keys, piles = list(piles), list(piles.values())
+    else:
+        pile_keys, piles = list(range(len(piles))), list(piles)
+    if methods is None:
+        methods = [Olson90]
+
+    # Check unit systems
+    systems = set(i.unit_system for i in profiles + piles)
+    if len(systems) > 1:
+        raise ValueError("All profiles and piles must use the same unit "
+                         "system.")
+
+    packed = ([_pack_profile(i) for i in profiles],
+              [_pack_pile(i) for i in piles], list(methods))
+    tasks = list(itertools.product(range(len(profiles)), range(len(piles)),
+                                   range(len(methods))))
+
+    if (workers is None) or (workers == 1):
+        saved = dict(_state)
+        _init_worker(*packed)
+        try:
+            results = [_run_task(task) for task in tasks]
+        finally:
+            _state.update(saved)
+    else:
+        if chunksize is None:
+            chunksize = max(1, len(tasks) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker,
+                                 initargs=packed) as executor:
+            results = list(executor.map(_run_task, tasks,
+                                        chunksize=chunksize))
+
+    columns = ['Profile', 'Pile', 'Method', 'Capacity', 'Plugged', 'Error']
+    rows = [(profile_keys[i], pile_keys[j]) + res
+            for (i, j, _), res in zip(tasks, results)]
+
+    return pd.DataFrame(rows, columns=columns)
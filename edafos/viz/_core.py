@@ -148,11 +148,11 @@ class ProfilePlot(object):
         ax2 = fig.add_subplot(122)
 
         # Get soil layer depths
-        depths = self.obj.layers['Depth'].values
+        depths = self.obj._store.column('Depth')
         # Add zero at the beginning of the array
         depths = np.insert(depths, 0, 0)
         # Get soil type
-        soil_type = self.obj.layers['Soil Type']
+        soil_type = self.obj._store.column('Soil Type')
         # Loop through layer depth array and add fills to the axis
         s_type_list = []
         for h_top, h_bot, s_t in zip(depths[:-1], depths[1:], soil_type):
@@ -0,0 +1,415 @@
+from .context import units, SoilProfile
+from edafos.project import Project
+from edafos.deepfoundations import Pile, Olson90, RevisedAPI, \
+    AnalysisContext, ResultCache
+import numpy as np
+import os
+import shutil
+import sys
+
+
+def mixed_profile():
+    profile = SoilProfile(unit_system='English', water_table=5)
+    profile.add_layer(soil_type='cohesive', height=8, tuw=108, su=0.6)
+    profile.add_layer(soil_type='cohesionless', soil_desc='sand', height=12,
+                      tuw=120, corr_n=8)
+    profile.add_layer(soil_type='cohesionless', soil_desc='sand-silt',
+                      height=6.5, tuw=125, corr_n=35)
+    profile.add_layer(soil_type='cohesive', height=10, tuw=110, su=1.2)
+    profile.add_layer(soil_type='cohesionless', soil_desc='gravel', height=14,
+                      tuw=130, corr_n=45)
+    profile.add_layer(soil_type='cohesive', height=20, tuw=115, su=2.5)
+
+    return profile
+
+
+def olson90(**kwargs):
+    project = Project(unit_system='English')
+    project.attach_sp(mixed_profile())
+    project.attach_pile(Pile(unit_system='English', **kwargs))
+
+    return Olson90(project)
+
+
+def test_olson90_pipe_closed():
+    api = olson90(pile_type='pipe-closed', length=40, diameter=14,
+                  thickness=0.5)
+
+    np.testing.assert_almost_equal(api.capacity, 263.0992504831711, 8)
+    assert api.plugged
+    np.testing.assert_almost_equal(api.tab_results.iloc[-1, 1],
+                                   103.54888608132691, 8)
+
+
+def test_olson90_pipe_open():
+    api = olson90(pile_type='pipe-open', length=45, diameter=18,
+                  thickness=0.5, pen_depth=42)
+
+    np.testing.assert_almost_equal(api.capacity, 234.11545126056203, 8)
+    assert not api.plugged
+    np.testing.assert_almost_equal(api.tab_results.iloc[-1, 2],
+                                   99.12251752810894, 8)
+
+
+def test_olson90_h_pile():
+    api = olson90(pile_type='h-pile', shape='HP14X89', length=52)
+
+    np.testing.assert_almost_equal(api.capacity, 445.34270439090324, 8)
+    assert api.plugged
+    np.testing.assert_almost_equal(api.tab_results.iloc[-1].values,
+                                   [70.5, 184.7808268006894,
+                                    275.98903158083687, 0, 0,
+                                    184.7808268006894, 460.76985838152626], 8)
+
+
+def test_olson90_tapered():
+    api = olson90(pile_type='concrete', shape='square-solid', side=16,
+                  length=35, taper_dims=[[14, 20], [10, 15]])
+
+    np.testing.assert_almost_equal(api.capacity, 226.48207437181537, 8)
+    assert api.plugged
+
+
+def test_average_toe_su_at():
+    api = olson90(pile_type='pipe-closed', length=40, diameter=14,
+                  thickness=0.5)
+    su = api.average_toe_su_at([5, 7.5, 30, 40, 55, 70.5])
+
+    # Cached per pile toe and soil profile
+    assert api.average_toe_su(False) is api.average_toe_su(False)
+    np.testing.assert_almost_equal(api.average_toe_su().magnitude,
+                                   su.magnitude[3], 10)
+    # The window below 7.5 ft and 40 ft reaches into sand layers
+    np.testing.assert_almost_equal(su.magnitude, [0.6, np.nan, 1.2, np.nan,
+                                                  2.5, 2.5], 10)
+
+
+def test_olson90_table_values():
+    api = olson90(pile_type='pipe-closed', length=40, diameter=14,
+                  thickness=0.5)
+    soil_desc = ['gravel', 'sand', 'sand', 'sand-silt', 'silt', 'silt']
+    corr_n = [4, 5, 101, 250, 30, 31]
+    values = api.olson90_table_values(soil_desc, corr_n)
+
+    for i, (d, n) in enumerate(zip(soil_desc, corr_n)):
+        for res, req in zip(values, ['delta', 'f_lim', 'N_q', 'q_lim']):
+            expected = api.olson90_table(d, n, req)
+            assert res[i] == getattr(expected, 'magnitude', expected)
+
+
+def test_with_units_false():
+    api = olson90(pile_type='pipe-open', length=45, diameter=18,
+                  thickness=0.5, pen_depth=42)
+    pile, sp = api.project.pile, api.project.sp
+
+    assert pile.xsection_area(20, with_units=False) == \
+        pile.xsection_area(20).magnitude
+    assert pile.side_area(10, 20, inside=True, with_units=False) == \
+        pile.side_area(10, 20, inside=True).magnitude
+    assert pile.aeol(with_units=False) == pile.aeol().magnitude
+    assert sp.calculate_stress(20, with_units=False) == \
+        sp.calculate_stress(20).magnitude
+    assert api.olson90_table('sand', 8, 'q_lim', with_units=False) == \
+        api.olson90_table('sand', 8, 'q_lim').magnitude
+    np.testing.assert_array_equal(
+        api.average_toe_su_at([5, 30], with_units=False),
+        api.average_toe_su_at([5, 30]).magnitude)
+
+
+def test_capacity_curve():
+    api = olson90(pile_type='pipe-open', length=45, diameter=18,
+                  thickness=0.5, pen_depth=42)
+    depths = [8, 13.3, 30, 42, 60.1]
+    curve = api.capacity_curve(depths)
+
+    # Each row matches the toe row of a full analysis at that depth
+    for i, d in enumerate(depths):
+        run = olson90(pile_type='pipe-open', length=d + 3, diameter=18,
+                      thickness=0.5, pen_depth=d)
+        toe = run.tab_results[run.tab_results.iloc[:, 0] == d]
+        np.testing.assert_array_equal(toe.values[0], curve.iloc[i, :7].values)
+
+    np.testing.assert_almost_equal(curve.iloc[3, 7], api.capacity, 8)
+
+    try:
+        api.capacity_curve([0, 10])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("ValueError not raised at ground surface.")
+
+
+def test_min_pen_depth():
+    api = olson90(pile_type='pipe-closed', length=40, diameter=14,
+                  thickness=0.5)
+    depth = api.min_pen_depth(200 * units.kip, tol=1e-6)
+
+    assert str(depth.units) == 'foot'
+    r_n = api.capacity_curve([depth.magnitude - 1e-5, depth.magnitude])
+    assert r_n.iloc[0, -1] < 200 <= r_n.iloc[1, -1]
+
+    # The capacity curve grid is cached, for the current state only
+    assert len(api._curve_cache[1]) == 1
+    depth = api.min_pen_depth(250, with_units=False)
+    assert len(api._curve_cache[1]) == 1
+    for i in range(3):
+        api.project.sp.update_layer(1, su=0.6 + i / 10)
+        api.min_pen_depth(250)
+        assert api._curve_cache[0] == api._state_key()
+        assert len(api._curve_cache[1]) == 1
+
+    # The answer sizes a pile directly
+    assert type(depth) is float
+    pile = Pile(unit_system='English', pile_type='pipe-closed', diameter=14,
+                thickness=0.5, length=depth, pen_depth=depth)
+    assert pile.pen_depth.magnitude == depth
+
+    try:
+        api.min_pen_depth(1e4)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("ValueError not raised for unreachable "
+                             "resistance.")
+
+
+def test_revised_api():
+    profile = SoilProfile(unit_system='English', water_table=50)
+    profile.add_layer(soil_type='cohesionless', height=50, tuw=120, corr_n=20)
+    project = Project(unit_system='English')
+    project.attach_sp(profile)
+    project.attach_pile(Pile(unit_system='English', pile_type='pipe-closed',
+                             length=40, diameter=12, thickness=0.5))
+    api = RevisedAPI(project)
+
+    # Medium dense: delta = 25, N_q = 20, K = 1.0 for full displacement
+    f_s = 1.0 * 0.120 * 20 * np.tan(np.deg2rad(25))
+    r_s = f_s * np.pi * 1.0 * 40
+    r_p = min(0.120 * 40 * 20, 100) * np.pi / 4
+    np.testing.assert_almost_equal(api.capacity, r_s + r_p, 8)
+    assert api.method_name == 'Revised API'
+
+    # Cohesive layers follow the same rules as Olson 90
+    olson = olson90(pile_type='pipe-closed', length=40, diameter=14,
+                    thickness=0.5)
+    api = RevisedAPI(olson.project)
+    seg = api._segment_arrays(olson.project.z_layer_pile())
+    clay = seg['soil_type'] == 'cohesive'
+    np.testing.assert_array_equal(api._unit_resistances(seg)[0][clay],
+                                  olson._unit_resistances(seg)[0][clay])
+
+
+def test_analysis_context():
+    project = olson90(pile_type='h-pile', shape='HP14X89', length=52).project
+    context = AnalysisContext(project)
+
+    olson = Olson90(project, context=context)
+    api = RevisedAPI(project, context=context)
+    np.testing.assert_almost_equal(olson.capacity, 445.34270439090324, 8)
+    assert api.capacity == RevisedAPI(project).capacity
+
+    # A context is tied to its project and to the state it was built from
+    try:
+        Olson90(olson90(pile_type='h-pile', shape='HP14X89',
+                        length=52).project, context=context)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("ValueError not raised for another project.")
+
+    project.sp.water_table = 10
+    assert not context.is_current()
+    try:
+        Olson90(project, context=context)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("ValueError not raised for a stale context.")
+
+
+def test_incremental():
+    project = olson90(pile_type='pipe-open', length=45, diameter=18,
+                      thickness=0.5, pen_depth=42).project
+    context = AnalysisContext(project)
+    olson = Olson90(project)
+    api = RevisedAPI(project, context=context)
+    segments = context.segments
+
+    changes = [(1, {'su': 0.8}), (2, {'corr_n': 14}), (2, {'tuw': 125}),
+               (3, {'su': 1.4, 'tuw': 105}),
+               (5, {'soil_type': 'cohesive', 'su': 3.0}), (5, {'su': 2.0})]
+    for layer, change in changes:
+        project.sp.update_layer(layer, **change)
+        olson.run()
+        api = RevisedAPI(project, context=context.refresh())
+
+        # Only the changed segments are calculated again
+        assert context.segments['side_out'] is segments['side_out']
+        assert context._changed.sum() < len(context.z) - 1
+        assert olson._toe_su_cache[0] == olson._state_key()
+        for method, cls in [(olson, Olson90), (api, RevisedAPI)]:
+            expected = cls(project)
+            assert method.capacity == expected.capacity
+            for name in expected.results.dtype.names:
+                np.testing.assert_array_equal(method.results[name],
+                                              expected.results[name])
+
+    # A new segment boundary rebuilds the context
+    project.sp.water_table = 12
+    context.refresh()
+    assert context._changed is None
+    assert 12 in context.z
+
+
+def test_fingerprint():
+    kwargs = dict(pile_type='pipe-closed', length=40, diameter=14,
+                  thickness=0.5)
+    olson = olson90(**kwargs)
+    same = olson90(**kwargs)
+    project = olson.project
+
+    # Same content, same fingerprint, whatever the project id
+    assert project.project_id != same.project.project_id
+    assert olson.fingerprint() == same.fingerprint()
+    assert project.fingerprint() == same.project.fingerprint()
+    assert len(olson.fingerprint()) == 32
+    assert RevisedAPI(project).fingerprint() != olson.fingerprint()
+
+    # Units do not matter, content does
+    fingerprint = project.pile.fingerprint()
+    project.pile.diameter = 14 * units.inch
+    assert project.pile.fingerprint() == fingerprint
+    project.pile.diameter = 14.5 * units.inch
+    assert project.pile.fingerprint() != fingerprint
+    assert olson.fingerprint() != same.fingerprint()
+
+    fingerprint = project.sp.fingerprint()
+    project.sp.update_layer(1, su=0.7)
+    assert project.sp.fingerprint() != fingerprint
+    project.sp.update_layer(1, su=0.6)
+    assert project.sp.fingerprint() == fingerprint
+
+
+def test_result_cache(tmp_path, monkeypatch):
+    project = olson90(pile_type='pipe-open', length=45, diameter=18,
+                      thickness=0.5, pen_depth=42).project
+    cache = ResultCache(maxsize=2, directory=str(tmp_path))
+
+    first = Olson90(project, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 1)
+    again = Olson90(project, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert again.capacity == first.capacity
+    assert again.plugged == first.plugged
+    assert again.tab_results.equals(first.tab_results)
+
+    # Results outlive the memory cache on disk
+    api = RevisedAPI(project, cache=cache)
+    keys = first.fingerprint(), api.fingerprint()
+    project.sp.update_layer(1, su=0.8)
+    assert first.fingerprint() not in keys
+    Olson90(project, cache=cache)
+    assert len(cache) == 2
+    assert keys[0] not in cache._entries
+    reloaded = ResultCache(directory=str(tmp_path))
+    assert reloaded.get(keys[0])['capacity'] == again.capacity
+    assert keys[1] in reloaded
+
+    # Explicit invalidation
+    cache.invalidate(keys[1])
+    assert (keys[1] not in cache) and (keys[1] not in reloaded)
+    # Results stored by another version are not used
+    cache.put(keys[1], api)
+    mod = sys.modules[ResultCache.__module__]
+    monkeypatch.setattr(mod, 'schema_version', mod.schema_version + 1)
+    upgraded = ResultCache(directory=str(tmp_path))
+    assert upgraded.tag != cache.tag
+    assert upgraded.get(keys[1]) is None
+    old = os.path.join(str(tmp_path), cache.tag, keys[1] + '.npz')
+    shutil.copy(old, os.path.join(str(tmp_path), upgraded.tag))
+    assert upgraded.get(keys[1]) is None
+
+    cache.clear()
+    assert len(cache) == 0
+    assert [list(i.iterdir()) for i in tmp_path.iterdir()] == [[], []]
+
+    # First in, first out
+    cache = ResultCache(maxsize=1, eviction='fifo')
+    cache.put('0' * 32, first)
+    cache.put('1' * 32, first)
+    assert list(cache._entries) == ['1' * 32]
+    for kwargs in [{'maxsize': 0}, {'eviction': 'random'}]:
+        try:
+            ResultCache(**kwargs)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("ValueError not raised for {}"
+                                 "".format(kwargs))
+
+
+def test_pre_check(capsys):
+    olson = olson90(pile_type='pipe-closed', length=40, diameter=14,
+                    thickness=0.5)
+    assert capsys.readouterr().out == ''
+    report = olson._pre_check(olson._required, verbose=True)
+    assert 'PRE-CHECK COMPLETE' in capsys.readouterr().out
+    assert report.passed
+    assert list(report.missing) == olson._required
+
+    profile = olson.project.sp
+    profile.update_layer(1, tuw=None)
+    profile.update_layer(2, soil_desc=None, corr_n=None)
+    report = olson._pre_check(olson._required, raise_errors=False)
+    assert not report.passed
+    np.testing.assert_array_equal(report.missing['corr_n'],
+                                  [False, True] + 4 * [False])
+    assert report.missing_properties(2) == ['soil_desc', 'corr_n']
+    assert str(report) == (
+        "OLSON 90 ANALYSIS PRE-CHECK:\n"
+        "Layer 1 (cohesive) is missing these properties: ['tuw']\n"
+        "Layer 2 (cohesionless) is missing these properties: "
+        "['soil_desc', 'corr_n']\n")
+    try:
+        olson._pre_check(olson._required)
+    except ValueError as error:
+        assert str(error) == str(report)
+    else:
+        raise AssertionError("ValueError not raised for missing properties.")
+
+
+def test_results():
+    api = olson90(pile_type='pipe-closed', length=40, diameter=14,
+                  thickness=0.5)
+
+    # The data frame is only built when asked for, then kept
+    assert api._tab_results is None
+    assert api.tab_results is api.tab_results
+    assert api.results.dtype.names[0] == 'depth'
+    np.testing.assert_array_equal(api.results['rn_p'],
+                                  api.tab_results['Rn_p (kip)'].values)
+    assert api.capacity == np.nanmax(api.results['rn_p'])
+
+
+def test_lazy(capsys):
+    project = olson90(pile_type='pipe-closed', length=40, diameter=14,
+                      thickness=0.5).project
+    capsys.readouterr()
+    api = Olson90(project, lazy=True)
+
+    # Nothing runs until results are read
+    assert capsys.readouterr().out == ''
+    assert api._run_key is None
+    np.testing.assert_almost_equal(api.capacity, 263.0992504831711, 8)
+    assert api.tab_results is api.tab_results
+
+    # Changing the inputs invalidates the results
+    project.pile.diameter = 12 * units.inch
+    project.pile.thickness = 0.5 * units.inch
+    expected = olson90(pile_type='pipe-closed', length=40, diameter=12,
+                       thickness=0.5)
+    assert api.capacity == expected.capacity
+    assert api.tab_results.equals(expected.tab_results)
+
+    project.sp.water_table = 2
+    assert api.capacity != expected.capacity
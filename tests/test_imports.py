@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+
+# -- Helper ------------------------------------------------------------------
+
+def loaded_after(statement):
+    """ Run ``statement`` in a fresh interpreter and return the heavy
+    modules it pulled in.
+    """
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    code = ("import sys\n"
+            "{}\n"
+            "print(*[i for i in ('pint', 'matplotlib', 'bokeh') "
+            "if i in sys.modules])".format(statement))
+    out = subprocess.run([sys.executable, '-c', code], cwd=root, check=True,
+                         capture_output=True, text=True).stdout.split()
+
+    return out
+
+
+# -- Tests -------------------------------------------------------------------
+
+def test_lazy_imports():
+    assert loaded_after("import edafos") == []
+
+    # The plotting stack and the unit registry are the slow imports
+    loaded = loaded_after(
+        "import edafos.soil, edafos.project, edafos.deepfoundations")
+    assert loaded == []
+
+    loaded = loaded_after("import edafos; edafos.units.meter")
+    assert loaded == ['pint']
@@ -0,0 +1,125 @@
+from .context import units
+from edafos.deepfoundations import Pile
+import numpy as np
+
+
+def case_a():
+    """ Tapered square concrete pile, partially embedded.
+    """
+    pile = Pile(unit_system='English', pile_type='concrete',
+                shape='square-solid', side=16, length=35, pen_depth=30,
+                taper_dims=[[14, 20], [10, 15]])
+
+    return pile
+
+
+def test_case_a():
+    pile = case_a()
+
+    # Breakpoints are compiled once
+    np.testing.assert_array_equal(pile.geometry.li, [0, 20, 35])
+    np.testing.assert_array_equal(pile.geometry.di, [16, 14, 10])
+
+    # Array queries agree with single depth queries
+    z = np.array([0, 5, 12.5, 22, 30])
+    np.testing.assert_array_equal(
+        pile._pile_a_d(z, with_units=False),
+        [pile._pile_a_d(i).magnitude for i in z])
+    np.testing.assert_array_equal(
+        pile._xsection_area(z),
+        [pile.xsection_area(i).magnitude for i in z])
+    np.testing.assert_array_equal(
+        pile._side_area(z[:-1], z[1:]),
+        [pile.side_area(i, ii).magnitude for i, ii in zip(z[:-1], z[1:])])
+
+    # By hand: sides (in) along the taper, 5 ft of pile above ground, and
+    # trapezoid faces between the segment ends
+    a = np.array([15.5, 15, 14.25, 14 - 4 * 7 / 15, 10]) / 12
+    np.testing.assert_almost_equal(pile._xsection_area(z), a ** 2, 12)
+    np.testing.assert_almost_equal(
+        pile._side_area(z[:-1], z[1:]),
+        4 * (a[:-1] + a[1:]) / 2 * np.diff(z), 12)
+
+    # The pile head is 5 ft above ground, there is no area above it
+    assert pile._xsection_area(-6) == 0
+    np.testing.assert_almost_equal(pile._pile_a_d(15, with_units=False), 14)
+
+
+def test_shapes():
+    z1, z2 = np.array([0.]), np.array([10.])
+
+    # Circle and ring
+    pile = Pile(unit_system='English', pile_type='pipe-open', diameter=18,
+                thickness=0.5, length=30)
+    areas = pile.segment_areas(np.array([0, 10]), with_units=False)
+    np.testing.assert_almost_equal(areas['side_out'], np.pi * 1.5 * 10, 12)
+    np.testing.assert_almost_equal(areas['side_in'], np.pi * 17 / 12 * 10,
+                                   12)
+    np.testing.assert_almost_equal(areas['toe_plugged'], np.pi / 4 * 1.5 ** 2,
+                                   12)
+    np.testing.assert_almost_equal(areas['toe_unplugged'],
+                                   np.pi / 4 * (1.5 ** 2 - (17 / 12) ** 2), 12)
+
+    # Cone of a tapered timber pile, 12 in to 8 in over 30 ft
+    pile = Pile(unit_system='English', pile_type='timber', diameter=12,
+                length=30, taper_dims=[[8, 30]])
+    np.testing.assert_almost_equal(
+        pile._side_area(z1, z2 * 3),
+        np.pi * (1 + 2 / 3) / 2 * np.sqrt((1 / 6) ** 2 + 30 ** 2), 12)
+    np.testing.assert_almost_equal(pile._xsection_area(np.array([15.])),
+                                   np.pi / 4 * (10 / 12) ** 2, 12)
+
+    # Octagon
+    pile = Pile(unit_system='English', pile_type='concrete', shape='octagon',
+                side=6, length=30)
+    np.testing.assert_almost_equal(pile._side_area(z1, z2), 8 * 0.5 * 10, 12)
+    np.testing.assert_almost_equal(pile._xsection_area(z1),
+                                   2 * (1 + np.sqrt(2)) * 0.5 ** 2, 12)
+
+    # H-pile section and box, from the HP14X89 table values
+    pile = Pile(unit_system='English', pile_type='h-pile', shape='HP14X89',
+                length=52)
+    areas = pile.segment_areas(np.array([0, 10]), with_units=False)
+    np.testing.assert_almost_equal(areas['side_out'], 57.05 / 12 * 10, 12)
+    np.testing.assert_almost_equal(areas['side_out_net'], 85.21 / 12 * 10,
+                                   12)
+    np.testing.assert_almost_equal(areas['toe_plugged'], 203.2 / 144, 12)
+    np.testing.assert_almost_equal(areas['toe_unplugged'], 26.1 / 144, 12)
+
+
+def test_segment_areas():
+    pile = Pile(unit_system='English', pile_type='h-pile', shape='HP14X89',
+                length=52)
+    z = np.array([0, 10, 25.5, 52])
+    areas = pile.segment_areas(z)
+
+    # Array forms agree with the single segment methods
+    np.testing.assert_array_equal(
+        pile.side_area(z[:-1], z[1:], box_area=True).magnitude,
+        areas['side_out'].magnitude)
+    np.testing.assert_array_equal(
+        [pile.side_area(i, ii).magnitude for i, ii in zip(z[:-1], z[1:])],
+        areas['side_out_net'].magnitude)
+    np.testing.assert_array_equal(pile.xsection_area(z[1:]).magnitude,
+                                  areas['toe_unplugged'].magnitude)
+    assert str(areas['toe_plugged'].units) == 'foot ** 2'
+
+    try:
+        pile.side_area([0, 10], [10, 5])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("ValueError not raised for z2 <= z1.")
+
+
+def test_aeol():
+    pile = case_a()
+
+    # By hand: 16 in to 14 in over 20 ft, then 14 in to 10 in over 15 ft
+    area = (20 * (16 ** 2 + 16 * 14 + 14 ** 2) / 3 +
+            15 * (14 ** 2 + 14 * 10 + 10 ** 2) / 3) / 35 / 144
+    np.testing.assert_almost_equal(pile.geometry.average_area(), area, 12)
+
+    aeol = (area * units.feet ** 2 * pile.modulus / pile.length).to(
+        pile.aeol().units)
+    np.testing.assert_almost_equal(pile.aeol().magnitude, aeol.magnitude, 6)
@@ -0,0 +1,158 @@
+from .context import SoilProfile
+import numpy as np
+
+
+def case_a():
+    profile = SoilProfile(unit_system='English', water_table=5)
+    for i in range(20):
+        profile.add_layer(soil_type='cohesive', height=1.5, tuw=100 + i,
+                          su=0.5)
+    profile.add_layer(soil_type='cohesionless', soil_desc='sand', height=2,
+                      tuw=120, corr_n=15)
+
+    return profile
+
+
+def test_case_a():
+    profile = case_a()
+    df = profile.layers
+
+    assert len(df) == 21
+    assert df.index.name == 'Layer'
+    assert list(df.index) == list(range(1, 22))
+    np.testing.assert_almost_equal(df['Depth'].values[-1], 32.0, 10)
+    np.testing.assert_almost_equal(df['TUW'].values[:20], np.arange(100, 120))
+    assert df['Soil Desc'][21] == 'sand'
+    assert np.isnan(df['Corr. N'][1])
+
+    # The data frame is cached until a new layer is added
+    cached = profile._layers
+    assert profile.layers.equals(df)
+    assert profile._layers is cached
+    profile.add_layer(soil_type='cohesive', height=1, tuw=110, su=1.0)
+    assert profile._layers is None
+    assert len(profile.layers) == 22
+
+    # Writing to the data frame does not change the soil profile, assigning
+    # one fails
+    df = profile.layers
+    df.loc[1, 'TUW'] = 150
+    assert profile.layers['TUW'][1] == 100
+    try:
+        profile.layers = df
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("AttributeError not raised for assignment.")
+    np.testing.assert_almost_equal(
+        profile.calculate_stress(1.5, kind='total').magnitude, 0.15, 10)
+
+
+def case_b():
+    profile = SoilProfile(unit_system='English', water_table=5)
+    profile.add_layers(soil_type=['cohesive', 'cohesionless', 'cohesive'],
+                       soil_desc=[None, 'sand', None],
+                       height=[8, 12, 10.5],
+                       tuw=[108, 120, 110],
+                       corr_n=[None, 8, None],
+                       su=[0.6, None, 1.2])
+
+    return profile
+
+
+def test_case_b():
+    profile = case_b()
+
+    # Same layers added one by one
+    other = SoilProfile(unit_system='English', water_table=5)
+    other.add_layer(soil_type='cohesive', height=8, tuw=108, su=0.6)
+    other.add_layer(soil_type='cohesionless', soil_desc='sand', height=12,
+                    tuw=120, corr_n=8)
+    other.add_layer(soil_type='cohesive', height=10.5, tuw=110, su=1.2)
+
+    assert profile.layers.equals(other.layers)
+
+    # Round trip through the layers data frame and a list of dicts
+    copy = SoilProfile(unit_system='English', water_table=5)
+    copy.add_layers(profile.layers)
+    copy.add_layers([{'soil_type': 'cohesive', 'height': 2, 'su': 2.0}])
+    np.testing.assert_almost_equal(copy.layers['Depth'].values,
+                                   [8, 20, 30.5, 32.5], 10)
+
+
+def test_case_b_errors():
+    profile = SoilProfile(unit_system='English', water_table=5)
+    bad_inputs = [
+        ({'soil_type': ['cohesive', 'rock'], 'height': [1, 1]}, ValueError),
+        ({'soil_type': ['cohesive'], 'height': [-1]}, ValueError),
+        ({'soil_type': ['cohesive'], 'height': ['1']}, TypeError),
+        ({'soil_type': ['cohesive'], 'height': [True]}, TypeError),
+        ({'soil_type': ['cohesive', 'cohesive'], 'height': [1, 1],
+          'tuw': [110, False]}, TypeError),
+        ({'soil_type': ['cohesive'], 'height': [1 + 1j]}, TypeError),
+        ({'soil_type': ['cohesive'], 'height': [1], 'soil_desc': ['clay']},
+         ValueError),
+        ({'soil_type': ['cohesive'], 'height': [1], 'phi': [30]},
+         AttributeError),
+    ]
+    for kwargs, error in bad_inputs:
+        try:
+            profile.add_layers(**kwargs)
+        except error:
+            pass
+        else:
+            raise AssertionError("{} not raised for {}".format(error, kwargs))
+    assert len(profile.layers) == 0
+
+
+def test_get_soil_props():
+    profile = case_b()
+    z = [0, 4, 8, 8.01, 20, 25, 30.5]
+    soil_type, corr_n, su = profile.get_soil_props(z, ['soil_type', 'corr_n',
+                                                       'su'])
+
+    assert list(soil_type) == ['cohesive', 'cohesive', 'cohesive',
+                               'cohesionless', 'cohesionless', 'cohesive',
+                               'cohesive']
+    np.testing.assert_equal(corr_n, [np.nan, np.nan, np.nan, 8, 8, np.nan,
+                                     np.nan])
+    assert su.units == profile.set_units('stress')
+    for i, j in zip(z, su.magnitude):
+        np.testing.assert_equal(profile.get_soil_prop(i, 'su').magnitude, j)
+
+
+def test_update_layer():
+    profile = case_b()
+    revision = profile._revision
+    stresses = profile._stress_table()
+
+    # Property changes keep the stress table, unit weights do not
+    profile.update_layer(2, corr_n=12, soil_desc='sand-silt')
+    assert profile._stress_table() is stresses
+    assert profile.layers['Corr. N'][2] == 12
+    profile.update_layer(3, tuw=115)
+    assert profile._stress_table() is not stresses
+    np.testing.assert_almost_equal(
+        profile.calculate_stress(30.5, kind='total').magnitude,
+        (8 * 108 + 12 * 120 + 10.5 * 115) / 1000, 8)
+
+    changes = profile._changes_since(revision)
+    assert changes == [(1, {'Corr. N', 'Soil Desc'}), (2, {'TUW'})]
+    # The water table is not a change of the first layer
+    profile.water_table = 12
+    assert profile._stress_table() is not stresses
+    assert profile._changes_since(revision)[-1] == (None, {'Water Table'})
+    profile.add_layer(soil_type='cohesive', height=1, tuw=110, su=1.0)
+    assert profile._changes_since(revision) is None
+
+    bad_inputs = [((0,), {'su': 1.0}, ValueError),
+                  ((2,), {'height': 3}, AttributeError),
+                  ((2,), {'su': -1.0}, ValueError),
+                  ((2,), {'soil_type': 'rock'}, ValueError)]
+    for args, kwargs, error in bad_inputs:
+        try:
+            profile.update_layer(*args, **kwargs)
+        except error:
+            pass
+        else:
+            raise AssertionError("{} not raised for {}".format(error, kwargs))
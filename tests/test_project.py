@@ -0,0 +1,19 @@
+from .context import units
+from edafos import set_units
+from edafos.project import Project
+
+
+def test_set_units():
+    project = Project(unit_system='English')
+
+    # Units are precomputed once per unit system
+    assert project.set_units('stress') is set_units('stress', 'English')
+    assert set_units('length', 'SI') == units.meter
+    assert (1 * set_units('tuw', 'English')).to(units.lbf / units.feet ** 3)\
+        .magnitude == 1.0
+    try:
+        project.set_units('weight')
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("KeyError not raised for unknown dimension.")
@@ -67,3 +67,56 @@ def test_case_c():
     assert pore_b.units == units.kip / units.feet ** 2
     np.testing.assert_almost_equal(effective_b.magnitude, 0.243, 3)
     assert effective_b.units == units.kip / units.feet ** 2
+
+
+def case_d():
+    profile = SoilProfile(unit_system='English', water_table=-7)
+    profile.add_layer(soil_type='cohesionless', height=4.5, tuw=90)
+    profile.add_layer(soil_type='cohesive', height=4.5, tuw=110)
+    z = [-3, 0, 2, 4.5, 7, 9]
+    total, pore, effective = profile.calculate_stress(z, kind='all')
+
+    # By hand, in lbf/ft2, with 7 ft of water above ground
+    expected = [[249.6, 249.6, 0],
+                [436.8, 436.8, 0],
+                [436.8 + 2 * 90, 9 * 62.4, 55.2],
+                [436.8 + 4.5 * 90, 11.5 * 62.4, 124.2],
+                [841.8 + 2.5 * 110, 14 * 62.4, 243.2],
+                [841.8 + 4.5 * 110, 16 * 62.4, 338.4]]
+
+    return total, pore, effective, np.array(expected) / 1000
+
+
+def test_case_d():
+    total, pore, effective, expected = case_d()
+
+    assert total.units == units.kip / units.feet ** 2
+    assert effective.units == units.kip / units.feet ** 2
+    np.testing.assert_almost_equal(total.magnitude, expected[:, 0], 10)
+    np.testing.assert_almost_equal(pore.magnitude, expected[:, 1], 10)
+    np.testing.assert_almost_equal(effective.magnitude, expected[:, 2], 10)
+
+    # At the water table and at the layer interface below it
+    profile = SoilProfile(unit_system='English', water_table=3)
+    profile.add_layer(soil_type='cohesionless', height=4.5, tuw=90)
+    profile.add_layer(soil_type='cohesive', height=4.5, tuw=110)
+    total, pore, effective = profile.calculate_stress([3, 4.5], kind='all')
+    np.testing.assert_almost_equal(total.magnitude, [0.270, 0.405], 10)
+    np.testing.assert_almost_equal(pore.magnitude, [0, 0.0936], 10)
+    np.testing.assert_almost_equal(effective.magnitude, [0.270, 0.3114], 10)
+
+
+def test_stress_table_invalidation():
+    profile = SoilProfile(unit_system='English', water_table=10)
+    profile.add_layer(soil_type='cohesionless', height=16, tuw=90)
+    assert profile.calculate_stress(14) == 1.0104 * units.kip / units.feet ** 2
+
+    # Changing the water table rebuilds the cached stresses
+    profile.water_table = 16
+    assert profile.calculate_stress(14) == 1.260 * units.kip / units.feet ** 2
+    assert profile.water_table == 16 * units.feet
+
+    # So does adding a layer
+    profile.add_layer(soil_type='cohesive', height=4, tuw=110)
+    np.testing.assert_almost_equal(
+        profile.calculate_stress(20, kind='total').magnitude, 1.88, 10)
@@ -0,0 +1,79 @@
+from edafos import sweep
+from edafos.project import Project
+from edafos.deepfoundations import Pile, Olson90
+from .context import SoilProfile
+from .test_capacity import mixed_profile, olson90
+import numpy as np
+
+
+def test_sweep():
+    piles = {'pipe': Pile(unit_system='English', pile_type='pipe-closed',
+                          length=40, diameter=14, thickness=0.5),
+             'h-pile': Pile(unit_system='English', pile_type='h-pile',
+                            shape='HP14X89', length=52),
+             'too long': Pile(unit_system='English', pile_type='h-pile',
+                              shape='HP14X89', length=80)}
+    profiles = {'B-1': mixed_profile(), 'B-2': mixed_profile()}
+
+    serial = sweep.run(profiles, piles)
+    parallel = sweep.run(profiles, piles, workers=2)
+
+    assert serial.equals(parallel)
+    assert len(serial) == 6
+    assert serial['Error'].notnull().sum() == 2
+
+    row = serial[(serial['Profile'] == 'B-2') & (serial['Pile'] == 'pipe')]
+    np.testing.assert_almost_equal(
+        row['Capacity'].iloc[0],
+        olson90(pile_type='pipe-closed', length=40, diameter=14,
+                thickness=0.5).capacity, 10)
+
+
+def test_sweep_changed_pile():
+    pile = Pile(unit_system='English', pile_type='pipe-open', length=45,
+                diameter=18, thickness=0.5)
+    pile.pen_depth = 42 * pile.set_units('pile_length')
+    result = sweep.run([mixed_profile()], [pile])
+
+    # Workers analyse the pile as it is, not as it was created
+    np.testing.assert_almost_equal(
+        result['Capacity'].iloc[0],
+        olson90(pile_type='pipe-open', length=45, diameter=18,
+                thickness=0.5, pen_depth=42).capacity, 10)
+
+    pile.pile_type = 'pipe-closed'
+    try:
+        sweep.run([mixed_profile()], [pile])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("ValueError not raised for a changed pile type.")
+
+
+def test_sweep_si():
+    profile = SoilProfile(unit_system='SI', water_table=2)
+    profile.add_layer(soil_type='cohesive', height=6, tuw=18, su=50)
+    profile.add_layer(soil_type='cohesionless', soil_desc='sand', height=14,
+                      tuw=19, corr_n=25)
+    piles = [Pile(unit_system='SI', pile_type='pipe-closed', diameter=40,
+                  thickness=1, length=15),
+             Pile(unit_system='SI', pile_type='concrete',
+                  shape='square-solid', side=40, length=16,
+                  taper_dims=[[35, 10], [30, 6]])]
+    piles[0].pen_depth = 14 * piles[0].set_units('pile_length')
+
+    # The rebuilt piles are the same, modulus and taper included
+    for pile in piles:
+        rebuilt = sweep._unpack_pile(sweep._pack_pile(pile))
+        assert rebuilt.fingerprint() == pile.fingerprint()
+        assert rebuilt.modulus == pile.modulus
+        assert rebuilt.aeol() == pile.aeol()
+
+    result = sweep.run([profile], piles)
+    assert result['Error'].isnull().all()
+    for pile, capacity in zip(piles, result['Capacity']):
+        project = Project(unit_system='SI')
+        project.attach_sp(profile)
+        project.attach_pile(pile)
+        np.testing.assert_almost_equal(capacity, Olson90(project).capacity,
+                                       10)